@@ -20,14 +20,41 @@ Flask API Endpoints:
 - `/Fetus-Location`            : Identifies fetus location in ultrasound images.
 - `/Organ-Location`            : Detects organ positioning in ultrasound scans.
 - `/Organ-Assessment`          : Evaluates organ health using AI models.
-- `/Fetal-Echocardiography`    : Analyzes fetal heart structure.
+- `/Fetal-Echocardioghraphy`   : Analyzes fetal heart structure.
 - `/Fetal-Brain-Abnormality`   : Identifies abnormalities in fetal brain development.
-- `/generate-findings/`        : Generates medical findings and recommendations.
+- `/generate-findings/`        : Findings, abnormality details and recommendations from the detections of
+                                 posted frame results or of a session's scan (`findingsEngine.py`).
+- `/analyze-video`             : Decodes an uploaded or stored MP4 on the server and runs one or more exams on it.
+- `/multi-analysis`            : Runs several exams on one set of frames, decoding every frame once.
+- `/sessions/<session_id>`     : Running scan statistics of a session (frames, detections, best frames).
+- `/jobs`                      : Submits a video or frame set as a background job (job queue status on GET).
+- `/jobs/<job_id>`             : Status of a background job.
+- `/jobs/<job_id>/results`     : Results of a job as a resumable SSE stream (`offset` / `Last-Event-ID`),
+                                 or one JSON page with `stream=0`.
+- Socket.IO namespace `/scan`  : Streams a whole scan over one WebSocket connection (scanSessions.py,
+                                 off with `AI_SOCKETIO=0`).
+- `/models`                    : Reports load status, load time and memory of the AI models.
+- `/frame-storage`             : Reports the frame storage mode and background writer metrics.
+- `/result-cache`              : Reports the inference result cache (hits, misses, size).
+- `/metrics`                   : Prometheus metrics (stage, route and model timings, counters, gauges).
 
 Data Processing:
-- Receives video frames as JSON data.
-- Uses AI-based models (`process_framesX`) to analyze images.
+- Receives video frames as JSON data URLs, multipart image parts or a length-prefixed binary stream.
+- Uses one detection pipeline (`detectionPipeline.run_task`) for all six exams; the model and
+  relevant classes of each route come from the task table in `examTasks.py`.
+- Runs frames through the models in batches (`batch_size` / `max_wait` per request).
+- Reports blank and probe-off frames as `rejected` (with a reason) instead of running the models
+  on them (`frameQuality.py`).
+- Crops screen-recorded frames to the ultrasound sector before inference; `boxes` stay in
+  full-frame coordinates (`fanRegion.py`).
 - Streams results back to the frontend for real-time updates.
+- Optional `response_mode=compact` streams detections only; `images` controls which frames
+  carry an annotated image (`all`, `detections`, `none`).
+- Optional `profile=fast` runs the quantised, reduced-resolution models for screening.
+- Optional `emit=filtered` streams only frames with a valid class of the exam and ends the stream
+  with the best frames overall and per class (`frameSelection.py`).
+- Optional `mode=track` runs the models on keyframes only and tracks objects in between, with
+  stable track IDs and "seen in frames X-Y" spans in the session summary (`frameTracking.py`).
 
 Security Considerations:
 - CORS enabled to allow frontend communication.
@@ -48,7 +75,7 @@ Error Handling:
 # Base64           : Decodes base64-encoded image data.
 # JSON             : Handles structured API responses.
 # OS               : Manages server-side file storage.
-# AI Models        : Custom Python modules (`process_framesX`) for medical image analysis.
+# AI Models        : Shared detection pipeline (`detectionPipeline.py`) for medical image analysis.
 #----------------------------------------------------------------------------------------------------
 # ENV OF FILE : BACKEND (PYTHON, FLASK, AI MODELS)
 # SECURITY CODE LEVEL : HIGH
@@ -62,16 +89,31 @@ import os
 import base64  # Keep this import
 import cv2
 
-from placentalDetection import process_frames
-from FetalAbnormality import process_frames2
-from fetalEchoCardiography import process_frames3
-from organAssessment import process_frames4
-from organLocation import process_frames5
-from fetusDetection import process_frames6
+from examTasks import get_task, parse_task_list
+from detectionPipeline import run_task, run_tasks, get_scan_state
+from modelRegistry import registry, preload_models
+from frameStorage import frame_writer
+from resultCache import result_cache
+from metrics import metrics, track_stream, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from workspaces import workspaces
+from binaryTransport import read_frames
+from requestOptions import parse_options
+from resultEncoding import sse_event
+from videoIngestion import resolve_upload_path, save_uploaded_video, iter_video_frames
+from jobQueue import job_queue, JobQueueFull
+from findingsEngine import generate_findings
+from scanSessions import socketio, ScanConfig
 
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
+CORS(app, expose_headers=["X-Session-Id"])  # Enable CORS for React frontend
+
+# WebSocket scan sessions (Socket.IO namespace /scan, see scanSessions.py), unless AI_SOCKETIO=0
+if ScanConfig.ENABLED:
+    socketio.init_app(app)
+
+# Load all models up front when AI_MODEL_LOADING=eager (lazy loading otherwise)
+preload_models()
 
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -80,188 +122,360 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 from flask import Response, jsonify
 import json
 
-@app.route("/Placental-Detection", methods=["POST"])
-def analyze_video():
-    if "frames" not in request.json:
-        return jsonify({"success": False, "error": "No frames provided"}), 400
 
-    frames = request.json["frames"]
+def scan_summaries(workspace, task_names):
+    """Frame counts and best frames of each exam in a session, closing a filtered stream."""
+    return {name: get_scan_state(workspace, name).summary() for name in task_names}
 
-    if not frames:
-        return jsonify({"success": False, "error": "No frames data"}), 400
 
-    def generate():
-        try:
-            # Stream each processed frame result incrementally
-            for result in process_frames(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
-        except Exception as e:
-            # Stream the error message immediately if an exception occurs
-            yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
+def session_stream(events, workspace):
+    """SSE response of a session's results; the workspace of a request without a session is released at the end."""
+    response = Response(events, content_type="text/event-stream", headers={"X-Session-Id": workspace.id})
+    # Runs however the stream ends: completed, failed or closed by a disconnecting client
+    response.call_on_close(lambda: workspaces.release(workspace))
+    return response
 
-    # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")
 
+def analyze_frames(task_name=None):
+    """
+    Shared handler of the exam routes: stream one result per submitted frame.
 
-@app.route("/Fetus-Location", methods=["POST"])
-def analyze_video2():
-    if "frames" not in request.json:
+    Without `task_name` (the `/multi-analysis` route) the `tasks` parameter lists the exams to run
+    on every frame; each frame is decoded once and every result is tagged with its `task`.
+    """
+    try:
+        # Frames may arrive as JSON data URLs, multipart file parts or a length-prefixed binary stream
+        frames, params = read_frames(request)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    if frames is None:
         return jsonify({"success": False, "error": "No frames provided"}), 400
 
-    frames = request.json["frames"]
+    try:
+        task_names = [task_name] if task_name else parse_task_list(params.get("tasks"))
+        # Response format, profile, emit, mode, batching and session (see requestOptions.py)
+        options = parse_options(params, task_names, request.headers.get("X-Session-Id"))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    route = request.path
 
     if not frames:
         return jsonify({"success": False, "error": "No frames data"}), 400
 
+    # Per-session scratch workspace (anonymous, released after this stream, without a session id)
+    workspace = workspaces.get_or_create(options.session_id)
+
     def generate():
         try:
             # Stream each processed frame result incrementally
-            for result in process_frames6(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
+            if task_name:
+                results = run_task(task_name, frames, workspace=workspace, **options.pipeline_kwargs())
+            else:
+                results = run_tasks(task_names, frames, workspace=workspace, **options.pipeline_kwargs())
+            for result in track_stream(route, results, task_name or ''):
+                yield sse_event({'success': True, 'result': result}, options.compact)
+            if options.emit == "filtered":
+                yield sse_event({'success': True, 'summary': scan_summaries(workspace, task_names)}, options.compact)
         except Exception as e:
             # Stream the error message immediately if an exception occurs
             yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
 
     # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")
+    return session_stream(generate(), workspace)
 
 
-@app.route("/Organ-Location", methods=["POST"])
-def analyze_video3():
-    if "frames" not in request.json:
-        return jsonify({"success": False, "error": "No frames provided"}), 400
+@app.route("/Placental-Detection", methods=["POST"])
+def analyze_video():
+    return analyze_frames("Placental-Detection")
 
-    frames = request.json["frames"]
 
-    if not frames:
-        return jsonify({"success": False, "error": "No frames data"}), 400
+@app.route("/Fetus-Location", methods=["POST"])
+def analyze_video2():
+    return analyze_frames("Fetus-Location")
 
-    def generate():
-        try:
-            # Stream each processed frame result incrementally
-            for result in process_frames5(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
-        except Exception as e:
-            # Stream the error message immediately if an exception occurs
-            yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
 
-    # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")
+@app.route("/Organ-Location", methods=["POST"])
+def analyze_video3():
+    return analyze_frames("Organ-Location")
+
 
-    
 @app.route("/Organ-Assessment", methods=["POST"])
 def analyze_video4():
-    if "frames" not in request.json:
-        return jsonify({"success": False, "error": "No frames provided"}), 400
-
-    frames = request.json["frames"]
-
-    if not frames:
-        return jsonify({"success": False, "error": "No frames data"}), 400
-
-    def generate():
-        try:
-            # Stream each processed frame result incrementally
-            for result in process_frames4(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
-        except Exception as e:
-            # Stream the error message immediately if an exception occurs
-            yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
+    return analyze_frames("Organ-Assessment")
 
-    # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")
 
-    
 @app.route("/Fetal-Echocardioghraphy", methods=["POST"])
 def analyze_video5():
-    if "frames" not in request.json:
-        return jsonify({"success": False, "error": "No frames provided"}), 400
+    return analyze_frames("Fetal-Echocardioghraphy")
 
-    frames = request.json["frames"]
 
-    if not frames:
-        return jsonify({"success": False, "error": "No frames data"}), 400
+@app.route("/Fetal-Brain-Abnormality", methods=["POST"])
+def analyze_video6():
+    return analyze_frames("Fetal-Brain-Abnormality")
 
-    def generate():
-        try:
-            # Stream each processed frame result incrementally
-            for result in process_frames3(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
-        except Exception as e:
-            # Stream the error message immediately if an exception occurs
-            yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
 
-    # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")
+@app.route("/multi-analysis", methods=["POST"])
+def analyze_multiple():
+    # Several exams on one decoded frame set, e.g. {"tasks": ["Placental-Detection", "Organ-Assessment"], ...}
+    return analyze_frames()
 
-    
-@app.route("/Fetal-Brain-Abnormality", methods=["POST"])
-def analyze_video6():
-    if "frames" not in request.json:
-        return jsonify({"success": False, "error": "No frames provided"}), 400
 
-    frames = request.json["frames"]
+@app.route("/analyze-video", methods=["POST"])
+def analyze_uploaded_video():
+    # Accepts either a multipart upload (`video` file) or JSON naming a video in backend/Routes/uploads
+    params = request.form if request.files else (request.get_json(silent=True) or {})
 
-    if not frames:
-        return jsonify({"success": False, "error": "No frames data"}), 400
+    uploaded = "video" in request.files
+    try:
+        if not isinstance(params, dict):
+            raise ValueError("Expected a JSON object")
+        # One exam (`task`) or several exams sharing the decoded frames (`tasks`)
+        task_names = parse_task_list(params.get("tasks") or params.get("task"))
+        options = parse_options(params, task_names, request.headers.get("X-Session-Id"))
+        if not uploaded and not params.get("upload"):
+            return jsonify({"success": False, "error": "No video provided"}), 400
+        video_path = None if uploaded else resolve_upload_path(params.get("upload"))
+        workspace = workspaces.get_or_create(options.session_id)
+        if uploaded:
+            video_path = save_uploaded_video(request.files["video"], workspace.video_dir)
+    except FileNotFoundError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    route = request.path
 
     def generate():
         try:
-            # Stream each processed frame result incrementally
-            for result in process_frames2(frames):
-                yield f"data: {json.dumps({'success': True, 'result': result})}\n\n"
+            # Frames are decoded server-side and streamed through the same detection pipeline
+            frames = iter_video_frames(video_path, options.fps)
+            if len(task_names) == 1:
+                results = run_task(task_names[0], frames, workspace=workspace, **options.pipeline_kwargs())
+            else:
+                results = run_tasks(task_names, frames, workspace=workspace, **options.pipeline_kwargs())
+            for result in track_stream(route, results, task_names[0]):
+                yield sse_event({'success': True, 'result': result}, options.compact)
+            if options.emit == "filtered":
+                yield sse_event({'success': True, 'summary': scan_summaries(workspace, task_names)}, options.compact)
         except Exception as e:
-            # Stream the error message immediately if an exception occurs
             yield f"data: {json.dumps({'success': False, 'error': str(e)})}\n\n"
+        finally:
+            # Uploaded copies are only needed for this request
+            if uploaded and os.path.exists(video_path):
+                os.remove(video_path)
+
+    return session_stream(generate(), workspace)
+
+
+def job_frame_bytes(frame):
+    """Encoded image of one submitted frame: a data URL, or raw image bytes from a binary upload."""
+    if isinstance(frame, (bytes, memoryview)):
+        return bytes(frame)
+    if not isinstance(frame, str):
+        raise ValueError("Frames must be data URLs or image bytes")
+    _, separator, payload = frame.partition(",")
+    if not separator:
+        raise ValueError("Invalid frame data URL")
+    return base64.b64decode(payload)
+
+
+def save_job_frames(frames, directory):
+    """Write the submitted frames (data URLs or raw image bytes) of a job to numbered files."""
+    # Every frame is checked before anything is written, so a bad request leaves no job folder
+    encoded = [job_frame_bytes(frame) for frame in frames]
+    os.makedirs(directory, exist_ok=True)
+    for index, data in enumerate(encoded):
+        with open(os.path.join(directory, f"{index:06d}"), "wb") as frame_file:
+            frame_file.write(data)
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    # A multipart `video`, a stored upload (`upload`) or a frame set, analysed in the background
+    uploaded = "video" in request.files
+    try:
+        if uploaded:
+            frames, params = None, request.form.to_dict()
+        else:
+            frames, params = read_frames(request)
+        task_names = parse_task_list(params.get("tasks") or params.get("task"))
+        options = parse_options(params, task_names)
+        if not uploaded and not frames and not params.get("upload"):
+            return jsonify({"success": False, "error": "No video or frames provided"}), 400
+
+        job_id = job_queue.new_job_id()
+        job_dir = job_queue.job_dir(job_id)
+        if uploaded:
+            source = {"type": "video", "path": save_uploaded_video(request.files["video"], job_dir),
+                      "fps": options.fps}
+        elif frames:
+            save_job_frames(frames, job_dir)
+            source = {"type": "frames", "path": job_dir}
+        else:
+            source = {"type": "video", "path": resolve_upload_path(params.get("upload")), "fps": options.fps}
+    except FileNotFoundError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+    except (ValueError, IndexError) as e:
+        return jsonify({"success": False, "error": str(e) or "Invalid frame data"}), 400
+
+    job_params = {**options.pipeline_kwargs(), "session_id": options.session_id}
+    try:
+        job = job_queue.submit(job_id, task_names, job_params, source)
+    except JobQueueFull as e:
+        return jsonify({"success": False, "error": str(e)}), 503
+    return jsonify({"success": True, "job_id": job_id, "status": job["status"],
+                    "results_url": f"/jobs/{job_id}/results"}), 202
 
-    # Return a streaming response with the proper content type for server-sent events
-    return Response(generate(), content_type="text/event-stream")    
 
-# saving the images in required path
-UPLOAD_FOLDER = "frames/Report_images"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+@app.route("/jobs", methods=["GET"])
+def job_queue_status():
+    return jsonify({"success": True, **job_queue.stats()})
 
-@app.route("/generate-findings/", methods=["POST"])
-def generate_report_endpoint():
-    data = request.get_json()
-    
-    final_frames = []
-    boxes = []
-    
-    for i in range(len(data)):
-        final_frames.append(data[i]['annotated_image'])
-        boxes.append(data[i]['boxes'])
 
-   
+def job_summary(job):
+    fields = ("id", "status", "tasks", "result_count", "error", "created_at", "started_at", "finished_at")
+    return {field: job[field] for field in fields}
 
-    
 
-    try:
-        image_paths = []
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job"}), 404
+    return jsonify({"success": True, **job_summary(job)})
 
-        for idx, frame in enumerate(final_frames):
-            image_data = base64.b64decode(frame)
-            image_path = os.path.join(UPLOAD_FOLDER, f"image_{idx}.jpg")
-            with open(image_path, "wb") as img_file:
-                img_file.write(image_data)
-            image_paths.append(image_path)
 
-        # Call the generate_findings function with the stored images
-        findings, tumor_details, recommendations = generate_findings(image_paths, boxes)
+@app.route("/jobs/<job_id>/results", methods=["GET"])
+def job_results(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Unknown job"}), 404
 
+    # Resume after the last event the client saw (EventSource sends it back as Last-Event-ID)
+    try:
+        last_event_id = request.headers.get("Last-Event-ID")
+        offset = int(last_event_id) + 1 if last_event_id else int(request.args.get("offset", 0))
+    except ValueError:
+        return jsonify({"success": False, "error": "Invalid offset"}), 400
+    compact = job["params"].get("response_mode") == "compact"
+
+    if request.args.get("stream") == "0":
+        # Polling: the results stored so far, from `offset` on
+        results = list(job_queue.iter_results(job_id, offset, follow=False))
         return jsonify({
             "success": True,
-            "findings": findings,
-            "tumor_details": tumor_details,
-            "recommendations": recommendations
+            **job_summary(job_queue.get(job_id)),
+            "results": [{"seq": seq, "result": result} for seq, result in results],
+            "next_offset": results[-1][0] + 1 if results else offset,
         })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
-    pass
+
+    def generate():
+        for seq, result in job_queue.iter_results(job_id, offset):
+            yield sse_event({'success': True, 'result': result}, compact, event_id=seq)
+        # Closing event with the final job status (jobs can be purged meanwhile)
+        final = job_queue.get(job_id)
+        if final is not None:
+            yield sse_event({'success': final['status'] == 'done', 'job': job_summary(final)}, compact)
+
+    return Response(generate(), content_type="text/event-stream")
+
+
+@app.route("/sessions/<session_id>", methods=["GET"])
+def session_summary(session_id):
+    # Running scan statistics (frames seen, detections, best frames) of every exam in a session
+    workspace = workspaces.get(session_id)
+    if workspace is None:
+        return jsonify({"success": False, "error": "Unknown or expired session"}), 404
+    return jsonify({
+        "success": True,
+        "session_id": workspace.id,
+        "scans": {task_name: state.summary() for task_name, state in list(workspace.scan_states.items())},
+        # Near-duplicate frames answered without inference
+        "skipped_frames": sum(dedup.skipped for dedup in list(workspace.deduplicators.values())),
+        # Ultrasound sector crops fed to the models, per frame size (null: full frame)
+        "fan_regions": {
+            f"{shape[1]}x{shape[0]}": region.to_dict() if region is not None else None
+            for shape, region in list(workspace.fan_regions.items())
+        },
+    })
+
+
+@app.route("/models", methods=["GET"])
+def model_status():
+    # Per-model load status, load time and memory usage
+    return jsonify({"success": True, **registry.report()})
+
+
+@app.route("/frame-storage", methods=["GET"])
+def frame_storage_status():
+    # Storage mode and backpressure metrics of the background frame writer
+    return jsonify({"success": True, **frame_writer.stats()})
 
 
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    # Prometheus scrape target (values are per worker process)
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+@metrics.collector('ai_models_loaded', 'AI models loaded in this process.')
+def collect_loaded_models():
+    return [({}, sum(1 for entry in registry.report()['models'] if entry['loaded']))]
+
+
+@metrics.collector('ai_result_cache_events_total', 'Inference result cache lookups by outcome.', 'counter')
+def collect_cache_events():
+    stats = result_cache.stats()
+    return [({'outcome': outcome}, stats[outcome]) for outcome in ('hits', 'disk_hits', 'misses', 'evictions')]
+
+
+@metrics.collector('ai_frame_writer_dropped_total', 'Annotated frames dropped by the background writer.', 'counter')
+def collect_dropped_frames():
+    return [({}, frame_writer.stats()['dropped'])]
+
+
+@app.route("/result-cache", methods=["GET"])
+def result_cache_status():
+    # Hit rate and size of the inference result cache
+    return jsonify({"success": True, **result_cache.stats()})
+
+
+@app.route("/generate-findings/", methods=["POST"])
+def generate_report_endpoint():
+    # Findings from structured detections: the posted frame results, or the scan state of a session
+    data = request.get_json(silent=True)
+    try:
+        if isinstance(data, list):
+            frames, task_name, session_id = data, None, None
+        elif isinstance(data, dict):
+            frames, task_name = data.get("frames"), data.get("task")
+            session_id = data.get("session_id") or request.headers.get("X-Session-Id")
+        else:
+            raise ValueError("Expected a list of frame results or a JSON object")
+        if task_name:
+            get_task(task_name)
+
+        if frames is not None:
+            report = generate_findings(frames, task_name)
+        else:
+            # Everything the session's scan has analysed so far, aggregated by the pipeline
+            workspace = workspaces.get(session_id) if session_id else None
+            if workspace is None or not task_name or task_name not in workspace.scan_states:
+                return jsonify({"success": False, "error": "No frames, or no scan of this task in the session"}), 404
+            state = workspace.scan_states[task_name]
+            with state.lock:
+                report = state.findings.report(task_name)
+    except (ValueError, TypeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({"success": True, **report})
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # Development server only; production runs `python serve.py` (gunicorn, multiple workers)
+    if ScanConfig.ENABLED:
+        socketio.run(app, debug=True, host="0.0.0.0", port=5000, allow_unsafe_werkzeug=True)
+    else:
+        app.run(debug=True, host="0.0.0.0", port=5000)
 
@@ -0,0 +1,346 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Reproducible benchmark of the detection pipeline on the scan videos shipped with the repo
+# (`backend/Routes/uploads/*.mp4`, `08.01.2025_12.01.17_REC.mp4`) and the sample frame
+# (`AI/frames/placental_frames/frame_0000.jpg`).
+#
+# Usage:
+"""
+    python benchmark.py                                  # every video, every exam, both paths
+    python benchmark.py --tasks Placental-Detection --max-frames 120 --path direct
+    python benchmark.py --json bench.json                # also write a machine-readable report
+    python benchmark.py --baseline bench.json --tolerance 0.1
+                                                         # exit code 1 on a >10% regression
+
+Frames are sampled from the videos once (`--fps`, `--max-frames`) and sent as JPEG data URLs,
+the same format the client posts. Each scenario (video x exam x path) replays them through:
+- `direct` : the exam's `process_framesN` function.
+- `http`   : the Flask route of the exam through the test client, reading the SSE stream.
+
+Per scenario the report contains frames/sec, time to the first result, peak RSS, the per-stage
+breakdown of `stageTimer.py` and two latency figures:
+- `p50_ms` / `p95_ms` / `p99_ms` : Per-frame latency, from submitting a frame to its result. On the
+  `direct` path a frame counts as submitted when the pipeline takes it from the frame list; on
+  the `http` path all frames are submitted with the request.
+- `gap_p50_ms` / `gap_p95_ms` / `gap_p99_ms` : Interval between consecutive results (with batching
+  most results of a batch arrive together, so this shows how bursty the stream is).
+Identical videos (the re-upload families) are only replayed once.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# psutil                 : Peak resident memory, sampled in the background.
+# Flask test client      : Route-level replay without a network socket.
+# argparse / json        : Command line and report file.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, TOOLING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import sys
+import json
+import time
+import glob
+import base64
+import hashlib
+import argparse
+import importlib
+import threading
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(AI_DIR)
+
+DEFAULT_VIDEOS = sorted(glob.glob(os.path.join(REPO_DIR, 'backend', 'Routes', 'uploads', '*.mp4'))) + \
+    [os.path.join(REPO_DIR, '08.01.2025_12.01.17_REC.mp4')]
+SAMPLE_FRAME = os.path.join(AI_DIR, 'frames', 'placental_frames', 'frame_0000.jpg')
+
+# Legacy entry point of each exam: route name -> (module, function)
+ENTRY_POINTS = {
+    "Placental-Detection": ("placentalDetection", "process_frames"),
+    "Fetus-Location": ("fetusDetection", "process_frames6"),
+    "Organ-Location": ("organLocation", "process_frames5"),
+    "Organ-Assessment": ("organAssessment", "process_frames4"),
+    "Fetal-Echocardioghraphy": ("fetalEchoCardiography", "process_frames3"),
+    "Fetal-Brain-Abnormality": ("FetalAbnormality", "process_frames2"),
+}
+
+# A metric is only a regression when it moved by more than the tolerance and this much in absolute terms
+MIN_REGRESSION = {'fps': 0.5, 'p95_ms': 2.0, 'first_result_ms': 5.0}
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as video:
+        for chunk in iter(lambda: video.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def unique_videos(paths):
+    """Drop byte-identical copies, keeping the first path of each video."""
+    seen = {}
+    for path in paths:
+        if os.path.isfile(path):
+            seen.setdefault(file_digest(path), path)
+    return list(seen.values())
+
+
+def to_data_url(image):
+    import cv2
+
+    _, buffer = cv2.imencode('.jpg', image)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer).decode('utf-8')
+
+
+def load_inputs(videos, sample_fps, max_frames):
+    """Sampled frames of every input as data URLs: name -> list of frames."""
+    import cv2
+    from videoIngestion import iter_video_frames
+
+    inputs = {}
+    if os.path.isfile(SAMPLE_FRAME):
+        inputs[os.path.basename(SAMPLE_FRAME)] = [to_data_url(cv2.imread(SAMPLE_FRAME))]
+    for path in unique_videos(videos):
+        frames = []
+        for frame in iter_video_frames(path, sample_fps):
+            frames.append(to_data_url(frame))
+            if len(frames) >= max_frames:
+                break
+        if frames:
+            inputs[os.path.basename(path)] = frames
+    return inputs
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class PeakRss:
+    """Samples the resident memory of this process in the background and keeps the peak."""
+
+    def __init__(self, interval=0.01):
+        import psutil
+
+        self._process = psutil.Process()
+        self._interval = interval
+        self._stop = threading.Event()
+        self.peak = 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self._interval)
+
+    def __enter__(self):
+        self.peak = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+class TimedFrames(list):
+    """Frame list that notes when the pipeline takes each frame (its submit time), by frame index."""
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.submitted = {}
+
+    def __iter__(self):
+        for index, frame in enumerate(super().__iter__()):
+            self.submitted[index] = time.perf_counter()
+            yield frame
+
+
+def replay_direct(task_name, frames, options):
+    """Yield `(timestamp, failed, submitted)` per streamed result of the exam's process_framesN function."""
+    module_name, function_name = ENTRY_POINTS[task_name]
+    process = getattr(importlib.import_module(module_name), function_name)
+    # A fresh workspace numbers the frames from 0, in list order
+    frames = TimedFrames(frames)
+    for result in process(frames, options['batch_size'], options['max_wait'], options['response_mode']):
+        yield time.perf_counter(), 'error' in result, frames.submitted.get(result.get('frame_number'))
+
+
+def replay_http(task_name, frames, options, client):
+    """Yield `(timestamp, failed, submitted)` per SSE event of the exam's Flask route."""
+    submitted = time.perf_counter()
+    response = client.post(f"/{task_name}", json={
+        'frames': frames,
+        'batch_size': options['batch_size'],
+        'max_wait': options['max_wait'],
+        'response_mode': options['response_mode'],
+    }, buffered=False)
+    try:
+        pending = b''
+        for chunk in response.response:
+            pending += chunk if isinstance(chunk, bytes) else chunk.encode()
+            while b'\n\n' in pending:
+                event, pending = pending.split(b'\n\n', 1)
+                payload = json.loads(event[len(b'data: '):])
+                yield time.perf_counter(), not payload.get('success') or 'error' in payload.get('result', {}), submitted
+    finally:
+        response.close()
+
+
+def run_scenario(task_name, input_name, frames, path, options, client=None):
+    from stageTimer import stage_timer
+    from frameStorage import frame_writer
+    from resultCache import result_cache
+
+    stage_timer.reset()
+    if not options['warm_cache']:
+        result_cache.clear()
+    timestamps = []
+    latencies = []
+    errors = 0
+    with PeakRss() as rss:
+        start = time.perf_counter()
+        events = replay_direct(task_name, frames, options) if path == 'direct' else \
+            replay_http(task_name, frames, options, client)
+        for timestamp, failed, submitted in events:
+            timestamps.append(timestamp)
+            if submitted is not None:
+                latencies.append((timestamp - submitted) * 1000)
+            errors += failed
+        elapsed = time.perf_counter() - start
+        # Queued frame writes belong to this scenario, not the next one
+        frame_writer.flush()
+
+    intervals = [(b - a) * 1000 for a, b in zip([start] + timestamps, timestamps)]
+    gaps = intervals[1:]
+    return {
+        'task': task_name,
+        'input': input_name,
+        'path': path,
+        'frames': len(frames),
+        'results': len(timestamps),
+        'errors': errors,
+        'seconds': round(elapsed, 4),
+        'fps': round(len(timestamps) / elapsed, 2) if elapsed else None,
+        'first_result_ms': round(intervals[0], 2) if intervals else None,
+        'p50_ms': round(percentile(latencies, 0.50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99), 2) if latencies else None,
+        'gap_p50_ms': round(percentile(gaps, 0.50), 2) if gaps else None,
+        'gap_p95_ms': round(percentile(gaps, 0.95), 2) if gaps else None,
+        'gap_p99_ms': round(percentile(gaps, 0.99), 2) if gaps else None,
+        'peak_rss_bytes': rss.peak,
+        'stages': stage_timer.snapshot(),
+    }
+
+
+def scenario_key(entry):
+    return f"{entry['task']}|{entry['input']}|{entry['path']}"
+
+
+def compare(report, baseline, tolerance):
+    """Return the scenarios that got slower than the baseline by more than `tolerance`."""
+    previous = {scenario_key(entry): entry for entry in baseline.get('scenarios', [])}
+    regressions = []
+    for entry in report['scenarios']:
+        before = previous.get(scenario_key(entry))
+        if not before:
+            continue
+        for metric, minimum in MIN_REGRESSION.items():
+            old, new = before.get(metric), entry.get(metric)
+            if not old or new is None:
+                continue
+            # Throughput regresses downwards, latencies upwards
+            worse = old - new if metric == 'fps' else new - old
+            if worse > old * tolerance and worse > minimum:
+                regressions.append({'scenario': scenario_key(entry), 'metric': metric, 'baseline': old, 'value': new})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the AI detection pipeline on the sample scans")
+    parser.add_argument('--videos', nargs='*', default=DEFAULT_VIDEOS)
+    parser.add_argument('--tasks', nargs='*', default=list(ENTRY_POINTS))
+    parser.add_argument('--path', choices=('direct', 'http', 'both'), default='both')
+    parser.add_argument('--fps', type=float, default=30, help="sampling rate of the videos (client default: 30)")
+    parser.add_argument('--max-frames', type=int, default=150, help="frames replayed per video")
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--max-wait', type=float, default=None)
+    parser.add_argument('--response-mode', choices=('full', 'compact'), default=None)
+    parser.add_argument('--no-cache', action='store_true', help="disable the inference result cache")
+    parser.add_argument('--warm-cache', action='store_true',
+                        help="keep cached results between scenarios instead of starting each one cold")
+    parser.add_argument('--json', dest='json_path', help="write the report to this file")
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="allowed slowdown vs. the baseline")
+    args = parser.parse_args()
+
+    # Settings read at import time of the pipeline modules
+    os.environ['AI_STAGE_TIMING'] = '1'
+    os.environ.setdefault('AI_MODEL_LOADING', 'eager')
+    if args.no_cache:
+        os.environ['AI_RESULT_CACHE_MB'] = '0'
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    sys.path.insert(0, AI_DIR)
+    os.chdir(AI_DIR)
+
+    from examTasks import get_task
+    from modelRegistry import registry
+
+    tasks = [get_task(task_name).name for task_name in args.tasks]
+    inputs = load_inputs(args.videos, args.fps, args.max_frames)
+    options = {'batch_size': args.batch_size, 'max_wait': args.max_wait, 'response_mode': args.response_mode,
+               'warm_cache': args.warm_cache}
+    paths = ('direct', 'http') if args.path == 'both' else (args.path,)
+
+    client = None
+    if 'http' in paths:
+        from app import app
+        client = app.test_client()
+
+    # Models are loaded and warmed before timing so the first scenario is not penalised
+    for task_name in tasks:
+        registry.get(get_task(task_name).model_path)
+
+    report = {'python': sys.version.split()[0], 'options': {**options, 'fps': args.fps,
+              'max_frames': args.max_frames, 'cache': not args.no_cache}, 'scenarios': []}
+    for task_name in tasks:
+        for input_name, frames in inputs.items():
+            for path in paths:
+                entry = run_scenario(task_name, input_name, frames, path, options, client)
+                report['scenarios'].append(entry)
+                print(f"{task_name:<26} {input_name:<32} {path:<6} {entry['fps'] or 0:8.2f} fps   "
+                      f"p50 {entry['p50_ms'] or 0:7.2f}ms  p95 {entry['p95_ms'] or 0:7.2f}ms  "
+                      f"p99 {entry['p99_ms'] or 0:7.2f}ms  gap p95 {entry['gap_p95_ms'] or 0:7.2f}ms  "
+                      f"first {entry['first_result_ms'] or 0:7.2f}ms  "
+                      f"rss {entry['peak_rss_bytes'] / 2**20:7.1f}MB")
+
+    if json_path:
+        with open(json_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if baseline_path:
+        with open(baseline_path) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['scenario']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['value']}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module reads frames from an incoming request in any of the supported transports, so the
+# exam routes can take raw encoded images instead of base64 data URLs inside JSON.
+#
+# Key Features:
+"""
+Supported Transports:
+- `application/json`         : `{"frames": ["data:image/png;base64,...", ...]}` (original format).
+- `multipart/form-data`      : one or more `frames` file parts, each holding raw JPEG/PNG bytes.
+- `application/octet-stream` : a length-prefixed stream, each frame sent as a 4-byte big-endian
+                               length followed by that many bytes of encoded image data.
+
+Request Options:
+- JSON requests carry options (`batch_size`, `max_wait`, ...) in the body.
+- Multipart requests carry them as form fields, binary requests in the query string.
+
+Binary frames are returned as `memoryview` slices of the request buffer, so they are decoded by
+OpenCV without any intermediate Python string or copy.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# struct                 : Parses the 4-byte frame length prefixes.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, FLASK)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import struct
+
+LENGTH_PREFIX = struct.Struct('>I')
+
+
+def iter_length_prefixed(buffer):
+    """Split a length-prefixed binary buffer into zero-copy `memoryview` frames."""
+    view = memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        if offset + LENGTH_PREFIX.size > len(view):
+            raise ValueError("Truncated frame length prefix")
+        (length,) = LENGTH_PREFIX.unpack_from(view, offset)
+        offset += LENGTH_PREFIX.size
+        if length == 0 or offset + length > len(view):
+            raise ValueError("Invalid or truncated frame in binary stream")
+        yield view[offset:offset + length]
+        offset += length
+
+
+def read_frames(request):
+    """
+    Return `(frames, params)` for a JSON, multipart or length-prefixed binary request.
+
+    `frames` is None when the request carries no frames field at all.
+    """
+    mimetype = request.mimetype
+
+    if mimetype == 'multipart/form-data':
+        params = {**request.args.to_dict(), **request.form.to_dict()}
+        if 'frames' not in request.files:
+            return None, params
+        return [part.read() for part in request.files.getlist('frames')], params
+
+    if mimetype == 'application/octet-stream':
+        return list(iter_length_prefixed(request.get_data())), request.args.to_dict()
+
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        raise ValueError("Expected a JSON object with a `frames` list")
+    return body.get('frames'), body
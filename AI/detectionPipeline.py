@@ -0,0 +1,630 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This is the single detection engine behind all six exam routes. The exams only differ in their
+# YOLO weights and relevant classes, which come from the task table in `examTasks.py`; the frame
+# decoding, batching, inference, annotation, storage and result formatting below are shared.
+#
+# Key Features:
+"""
+Processing Pipeline:
+- Decodes incoming frames (data URLs, raw image bytes or already decoded frames) in batches.
+- Keeps blank and probe-off frames away from the models (`frameQuality.py`); they are reported
+  as `rejected` with a `reason` and their `quality` metrics.
+- Skips near-duplicate frames before inference; they reuse the detections of the frame they
+  repeat and are marked `skipped` / `duplicate_of` (see `frameDedup.py`).
+- Feeds only the ultrasound sector of screen-recorded frames to the models and maps the boxes back
+  to full-frame coordinates (`fanRegion.py`).
+- Runs each batch through the task's warm YOLO model from the model registry; frames already
+  analysed by the same weights are answered from the result cache (`resultCache.py`).
+- The inference profile (`reference` or `fast`, see `inferenceBackends.py`) picks the backend and
+  input size per request.
+- Annotates frames only when they are sent back or stored.
+- Runs as a staged pipeline (`stagedPipeline.py`): decoding and annotation / JPEG encoding run in
+  worker pools while batching and inference run on a background thread, with bounded queues
+  between the stages; the request thread updates the scan state and yields results in order.
+- Hands annotated frames to the background frame writer (per-session workspace folders).
+- Yields one result per frame, in frame order, in the `full` or `compact` response format.
+- One engine (`analyse_tasks`) serves one exam (`run_task`) or several exam models on one decoded
+  frame set (`run_tasks`, results tagged with their `task`), overlapping their inference.
+- Keeps per-scan counters and the most confident valid frames (overall and per class, see
+  `frameSelection.py`) in a `ScanState` stored in the session workspace, so statistics accumulate
+  across requests of one scan.
+- `emit='filtered'` only yields frames with a valid class of the exam (and errors).
+- Aggregates every analysed frame's detections into the scan's findings statistics
+  (`findingsEngine.py`), which `/generate-findings/` reports without touching images.
+- `mode='track'` runs the model on keyframes only and tracks the boxes in between, with stable
+  track IDs and a per-object frame span summary (see `frameTracking.py`).
+
+Streaming Data with Generators:
+- `run_task` is a generator, so results stream to the client as soon as each batch is done.
+- Per-frame errors are yielded as `{'frame_number', 'error'}` without stopping the stream.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Frame annotation.
+# NumPy                  : Conversion of detection arrays.
+# Supervision (sv)       : Parses YOLO model detections (imported on first use).
+# Model registry         : Warm, shared YOLO models (`modelRegistry.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (AI PROCESSING, FRAME INFERENCE)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from examTasks import get_task
+from modelRegistry import get_model, inference_lock
+from frameBatching import iter_frame_batches
+from resultEncoding import resolve_options, wants_image, encode_image, compact_result
+from frameStorage import frame_writer
+from frameDedup import get_deduplicator, duplicate_result
+from resultCache import result_cache, frame_key, CacheEntry
+from stageTimer import stage_timer
+from inferenceBackends import resolve_profile
+from frameSelection import TopK, class_confidences, resolve_emit
+from stagedPipeline import staged, submit, encode_pool, pipeline_depth
+from frameTracking import FrameTracker, resolve_mode, track_fields
+from frameQuality import frame_quality, gate_for
+from fanRegion import get_fan_region
+from findingsEngine import FindingsAccumulator
+from workspaces import workspaces
+
+
+class PipelineConfig:
+    BEST_FRAMES = int(os.getenv('AI_BEST_FRAMES', '2'))
+
+
+class ScanState:
+    """Running statistics of one scan, kept across requests and frames of a session."""
+
+    def __init__(self, valid_classes=(), best_frames_limit=None):
+        self.num_placental = 0
+        self.confidence = 0.0
+        self.class_name = ''
+        self.boxes = []
+        self.frames_seen = 0
+        self.valid_frames = 0
+        self.rejected = {}  # quality gate reason -> frames
+        self.valid_classes = set(valid_classes)
+        self.best_frames_limit = best_frames_limit or PipelineConfig.BEST_FRAMES
+        self._best = TopK(self.best_frames_limit)
+        self._best_by_class = {}  # class name -> TopK
+        self.tracker = None  # FrameTracker once the scan runs in track mode
+        self.findings = FindingsAccumulator(valid_classes)
+        self.lock = threading.Lock()
+
+    def record(self, frame_result, frame_confidence, valid_confidences, cache_key=None):
+        """Count a processed frame and keep it if it is among the most confident valid frames so far."""
+        self.frames_seen += 1
+        if not valid_confidences:
+            return
+        self.valid_frames += 1
+        frame_number = frame_result['frame_number']
+        # Detection fields only: sessions live for an hour, annotated images would pile up
+        kept = ({key: value for key, value in frame_result.items() if key != 'annotated_image'}, cache_key)
+        self._best.push(frame_confidence, frame_number, kept)
+        for class_name, confidence in valid_confidences.items():
+            best = self._best_by_class.setdefault(class_name, TopK(self.best_frames_limit))
+            best.push(confidence, frame_number, kept)
+
+    def record_rejection(self, reason):
+        """Count a frame the quality gate kept from the model."""
+        self.frames_seen += 1
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def record_duplicate(self, has_detections):
+        """Count a skipped duplicate frame like the frame it repeats (it is not stored again)."""
+        self.frames_seen += 1
+        if has_detections:
+            self.num_placental += 1
+
+    @staticmethod
+    def _with_images(items):
+        """Kept frames, with their annotated image while the result cache still holds it."""
+        frames = []
+        for frame_result, cache_key in items:
+            encoded_image = result_cache.image(cache_key) if cache_key is not None else None
+            frames.append(dict(frame_result, annotated_image=encoded_image) if encoded_image else frame_result)
+        return frames
+
+    def best_frames(self):
+        return self._with_images(self._best.items())
+
+    def summary(self):
+        with self.lock:
+            summary = {
+                'frames_seen': self.frames_seen,
+                'num_placental': self.num_placental,
+                'valid_frames': self.valid_frames,
+                'rejected_frames': dict(self.rejected),
+                'best_frames': self.best_frames(),
+                'best_frames_by_class': {
+                    class_name: self._with_images(best.items())
+                    for class_name, best in sorted(self._best_by_class.items())
+                },
+            }
+            if self.tracker is not None:
+                summary['tracking'] = self.tracker.summary()
+            return summary
+
+
+def get_scan_state(workspace, task_name):
+    """Scan state of `task_name` within a session workspace (created on first use)."""
+    state = workspace.scan_states.get(task_name)
+    if state is None:
+        state = workspace.scan_states.setdefault(task_name, ScanState(get_task(task_name).valid_classes))
+    return state
+
+
+def get_tracker(state):
+    """Tracker of a scan in track mode (created on first use, kept for the rest of the scan)."""
+    with state.lock:
+        if state.tracker is None:
+            state.tracker = FrameTracker()
+        return state.tracker
+
+
+def load_model(task, profile):
+    # Shared warm instance from the process-wide registry (loaded once per process and backend)
+    return get_model(task.model_path, profile.backend_for(task.model))
+
+
+def add_index_to_frames(frame, frame_number):
+    """Draw the frame number at the top centre of a copy of `frame`."""
+    frame_with_text = frame.copy()
+    text = f"{frame_number}"
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 1
+    thickness = 2
+    text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
+    text_x = (frame.shape[1] - text_size[0]) // 2
+    text_y = text_size[1] + 10
+    cv2.putText(
+        frame_with_text,
+        text,
+        (text_x, text_y),
+        font,
+        font_scale,
+        (255, 0, 0),  # Blue color in BGR
+        thickness,
+        cv2.LINE_AA,
+    )
+    return frame_with_text
+
+
+# Analyze detection results and queue frames for the background writer (AI_FRAME_STORAGE)
+def analyse_result(result, frame_number, frame_with_results, num_placental, confidence, class_name, boxes, workspace):
+    # supervision is only needed once frames are analysed, not at service startup
+    import supervision as sv
+
+    detections = sv.Detections.from_ultralytics(result)
+    classes_detected = detections.data['class_name']
+
+    if classes_detected.size > 0:
+        class_name = classes_detected.tolist()  # Convert NumPy array to list
+        boxes = detections.xyxy
+        num_placental += 1
+        confidence = detections.confidence[0]
+        output_path = os.path.join(workspace.placental_frames_dir, f"frame_{frame_number:04d}.jpg")
+        frame_writer.submit(output_path, frame_with_results, has_detections=True)
+    else:
+        output_path = os.path.join(workspace.no_placental_frames_dir, f"frame_{frame_number:04d}.jpg")
+        frame_writer.submit(output_path, frame_with_results, has_detections=False)
+
+    return num_placental, class_name, confidence, boxes
+
+
+def cache_keys(task, images, profile, region=None):
+    """Result cache keys of `images` for the task's weights (None where caching is off)."""
+    if not result_cache.enabled:
+        return [None] * len(images)
+    try:
+        # Backends, input sizes and crops give slightly different boxes, so each caches its own results
+        variant = profile.cache_variant(task.model)
+        cropped = f'{variant}:{region.variant}' if region is not None else variant
+        return [
+            frame_key(image, task.model_path, cropped if region is not None and region.applies(image) else variant)
+            for image in images
+        ]
+    except OSError:
+        # Weights that cannot be read for a checksum are never cached
+        return [None] * len(images)
+
+
+def predict_batch(task, model, images, profile, region=None):
+    """
+    Run one batch through the task's model (one batch at a time per shared model).
+
+    Returns the results and their cache keys, both in batch order. Cached frames skip inference.
+    With a fan `region`, frames of its size are cropped for the model and their results are
+    rebuilt on the full frame.
+    """
+    with stage_timer.stage('cache_lookup', model=task.model):
+        keys = cache_keys(task, images, profile, region)
+        results = [None] * len(images)
+        misses = []
+        for index, (image, key) in enumerate(zip(images, keys)):
+            entry = result_cache.get(key) if key is not None else None
+            if entry is not None:
+                results[index] = entry.to_result(image)
+            else:
+                misses.append(index)
+
+    if misses:
+        cropped = [region is not None and region.applies(images[index]) for index in misses]
+        inputs = [region.crop(images[index]) if crop else images[index] for index, crop in zip(misses, cropped)]
+        backend = profile.backend_for(task.model)
+        with inference_lock(task.model_path, backend), stage_timer.stage('inference', model=task.model):
+            predictions = list(model(inputs, **profile.predict_kwargs(model)))
+        for index, result, crop in zip(misses, predictions, cropped):
+            # Boxes of cropped frames go back to full-frame coordinates (and are cached that way)
+            if crop:
+                result = region.to_frame(result, images[index])
+            results[index] = result
+            if keys[index] is not None:
+                result_cache.put(keys[index], CacheEntry.from_result(result))
+    return results, keys
+
+
+def track_batch(task, model, frame_numbers, images, profile, tracker, region=None):
+    """
+    Detect-and-track variant of `predict_batch`: only keyframes go through the model.
+
+    Scheduled keyframes and scene changes are inferred in one call; the frames in between get
+    tracked boxes, and a frame whose tracks got lost is re-detected on its own. Tracked results
+    carry track IDs, so they get no cache keys.
+    """
+    with tracker.lock:
+        keyframes = tracker.plan(images)
+        keyframe_images = [image for image, keyframe in zip(images, keyframes) if keyframe]
+        detected = iter(predict_batch(task, model, keyframe_images, profile, region)[0])
+
+        results = []
+        for frame_number, image, keyframe in zip(frame_numbers, images, keyframes):
+            if keyframe:
+                results.append(tracker.observe(frame_number, image, next(detected)))
+                continue
+            with stage_timer.stage('track', model=task.model):
+                result = tracker.propagate(frame_number, image)
+            if result is None:
+                # Tracks were lost or became unreliable: this frame becomes a keyframe
+                (redetected,), _ = predict_batch(task, model, [image], profile, region)
+                result = tracker.observe(frame_number, image, redetected, redetection=True)
+            results.append(result)
+    return results, [None] * len(results)
+
+
+def screen_batch(entries, gates):
+    """
+    Run the decoded, non-duplicate frames of a batch through the quality gates of the tasks.
+
+    Returns `{task name: {frame_number: (reason, metrics)}}` of the rejected frames; the metrics
+    are computed once per frame however many tasks run on it.
+    """
+    rejections = {task_name: {} for task_name in gates}
+    active = {task_name: gate for task_name, gate in gates.items() if gate is not None}
+    if not active:
+        return rejections
+    with stage_timer.stage('quality'):
+        for frame_number, image, error, _, duplicate in entries:
+            if error is not None or duplicate:
+                continue
+            metrics = frame_quality(image)
+            for task_name, gate in active.items():
+                reason = gate.check(metrics)
+                if reason is not None:
+                    rejections[task_name][frame_number] = (reason, metrics)
+    return rejections
+
+
+def infer_batch(task, model, entries, profile, workspace, tracker=None, rejected=()):
+    """Results and cache keys of the frames of a batch that go to the model (decoded, new, not rejected)."""
+    frames = [(frame_number, image) for frame_number, image, error, _, duplicate in entries
+              if error is None and not duplicate and frame_number not in rejected]
+    images = [image for _, image in frames]
+    # Ultrasound sector of the session's frames, located on the first usable batch
+    with stage_timer.stage('fan_region'):
+        region = get_fan_region(workspace, images)
+    if tracker is None:
+        return predict_batch(task, model, images, profile, region)
+    return track_batch(task, model, [frame_number for frame_number, _ in frames], images, profile, tracker, region)
+
+
+def render_frame(result, image_policy, cache_key=None):
+    """
+    Annotate and encode one frame as far as it is sent back or stored.
+
+    Returns the annotated frame (or None) and the base64 JPEG of the response (or None).
+    """
+    # Annotated image already encoded for an earlier response of the same frame
+    cached_image = result_cache.image(cache_key) if cache_key is not None else None
+
+    # Annotate the frame with predictions, only if it is sent back (and not cached) or stored
+    has_detections = len(result.boxes) > 0
+    image_wanted = wants_image(image_policy, has_detections)
+    if (image_wanted and cached_image is None) or frame_writer.wants(has_detections):
+        with stage_timer.stage('annotate'):
+            frame_with_results = result.plot()
+    else:
+        frame_with_results = None
+
+    if not image_wanted:
+        return frame_with_results, None
+
+    # Convert the annotated frame to a base64 string when the image policy asks for it
+    if cached_image is None:
+        with stage_timer.stage('encode'):
+            cached_image = encode_image(frame_with_results)
+        if cache_key is not None:
+            result_cache.attach_image(cache_key, cached_image)
+    return frame_with_results, cached_image
+
+
+def render_batch(results, keys, image_policy):
+    """Start annotating a batch in the encode pool: `(result, cache_key, rendered future)` per frame."""
+    pool = encode_pool()
+    return [(result, key, submit(pool, render_frame, result, image_policy, key)) for result, key in zip(results, keys)]
+
+
+def analyse_frame(result, frame_number, state, workspace, response_mode, image_policy, cache_key=None,
+                  rendered=None):
+    """
+    Turn one model result into the per-frame payload and update the scan state.
+
+    `rendered` is the output of `render_frame` when the frame was annotated ahead (it is rendered
+    here otherwise). Returns the payload and whether the frame has a valid class of the exam.
+    """
+    frame_with_results, encoded_image = rendered or render_frame(result, image_policy, cache_key)
+    has_detections = len(result.boxes) > 0
+
+    with state.lock:
+        # Analyze the result and update the scan counters
+        with stage_timer.stage('analyse'):
+            state.num_placental, state.class_name, state.confidence, boxes = analyse_result(
+                result, frame_number, frame_with_results, state.num_placental, state.confidence,
+                state.class_name, state.boxes, workspace
+            )
+
+        # Ensure all box data is converted to lists (if numpy.ndarray)
+        state.boxes = [box.tolist() if isinstance(box, np.ndarray) else box for box in boxes]
+
+        if response_mode == 'compact':
+            # Detections only: class ids, boxes and confidences of this frame
+            frame_result = compact_result(result, frame_number, state.num_placental)
+        else:
+            frame_result = {
+                'frame_number': frame_number,
+                'class_name': state.class_name,
+                'num_placental': state.num_placental,
+                'confidence': float(state.confidence),  # Ensure confidence is a float
+                'boxes': state.boxes,  # Ensure boxes is a list
+                'annotated_image': None
+            }
+        # Track IDs and whether the frame was detected or tracked (track mode only)
+        frame_result.update(track_fields(result))
+
+        if encoded_image is not None:
+            frame_result['annotated_image'] = encoded_image
+
+        # Valid classes of the exam in this frame, for the filter and the best-frame selection
+        valid_confidences = class_confidences(result, state.valid_classes) if has_detections else {}
+        state.record(frame_result, float(state.confidence), valid_confidences, cache_key)
+
+        # Per-class statistics of the scan for the findings report
+        boxes = result.boxes
+        state.findings.add(frame_number, zip(
+            [result.names[class_id] for class_id in boxes.cls.int().tolist()], boxes.conf.tolist(),
+            boxes.xyxy.tolist(),
+        ))
+
+    return frame_result, bool(valid_confidences)
+
+
+def match_batch(batch, deduplicator):
+    """
+    Pair every frame of a batch with its dedup reference.
+
+    Returns `(frame_number, image, error, reference, is_duplicate)` tuples; `reference` is None for
+    frames that failed to decode or when deduplication is disabled.
+    """
+    entries = []
+    for frame_number, image, error in batch:
+        if error is None and deduplicator.enabled:
+            reference, is_duplicate = deduplicator.match(frame_number, image)
+        else:
+            reference, is_duplicate = None, False
+        entries.append((frame_number, image, error, reference, is_duplicate))
+    return entries
+
+
+def keep_reference(reference, task_name, frame_result, has_detections, is_valid, cache_key=None):
+    """
+    Keep what later duplicates of a reference frame need: its result without the annotated image.
+
+    References live as long as the session, so the image is not held here; duplicates get it back
+    from the result cache through `cache_key` while it is still cached.
+    """
+    if reference is None:
+        return
+    if frame_result.get('annotated_image') is not None:
+        frame_result = dict(frame_result, annotated_image=None)
+    reference.results[task_name] = (frame_result, has_detections, is_valid, cache_key)
+
+
+def reuse_result(task_name, reference, frame_number, state, image_policy):
+    """Result of a skipped frame, built from the detections of its reference frame (and its validity)."""
+    if task_name not in reference.results:
+        raise RuntimeError(f"Frame {reference.frame_number} it repeats could not be analysed")
+    reference_result, has_detections, is_valid, cache_key = reference.results[task_name]
+    with state.lock:
+        if reference_result.get('rejected'):
+            state.record_rejection(reference_result['reason'])
+        else:
+            state.record_duplicate(has_detections)
+        frame_result = duplicate_result(reference_result, frame_number, reference.frame_number)
+        frame_result['num_placental'] = state.num_placental
+    if cache_key is not None and wants_image(image_policy, has_detections):
+        encoded_image = result_cache.image(cache_key)
+        if encoded_image is not None:
+            frame_result['annotated_image'] = encoded_image
+    return frame_result, is_valid
+
+
+def reject_frame(task_name, frame_number, reason, metrics, reference, state):
+    """Result of a frame the quality gate kept from the model (kept for later duplicates)."""
+    with state.lock:
+        state.record_rejection(reason)
+        frame_result = {
+            'frame_number': frame_number,
+            'rejected': True,
+            'reason': reason,
+            'quality': metrics,
+            'num_placental': state.num_placental,
+        }
+    keep_reference(reference, task_name, frame_result, False, False)
+    return frame_result, False
+
+
+def analyse_reference(task_name, result, frame_number, reference, state, workspace, response_mode, image_policy,
+                      cache_key=None, rendered=None):
+    """Analyse an inferred frame and keep its result for later duplicates."""
+    frame_result, is_valid = analyse_frame(result, frame_number, state, workspace, response_mode, image_policy,
+                                           cache_key, rendered)
+    keep_reference(reference, task_name, frame_result, len(result.boxes) > 0, is_valid, cache_key)
+    return frame_result, is_valid
+
+
+def analyse_tasks(task_names, frames, batch_size=None, max_wait=None, response_mode=None, image_policy=None,
+                  workspace=None, states=None, profile=None, emit=None, mode=None):
+    """
+    Analyse `frames` with the models of one or more exams, decoding every frame only once.
+
+    Yields `(task_name, frame_result)` per frame in frame order and, within a frame, in the order
+    of `task_names`. Several models run concurrently on each batch. With `emit='filtered'` only
+    results with a valid class of their exam (and errors) are yielded. With `mode='track'` every
+    exam tracks its own objects between its own keyframes (see `track_batch`).
+    """
+    tasks = [get_task(task_name) for task_name in dict.fromkeys(task_names)]
+    if not tasks:
+        raise ValueError("No tasks requested")
+
+    # Response format and which frames carry an annotated image (see resultEncoding.py)
+    response_mode, image_policy = resolve_options(response_mode, image_policy)
+    emit = resolve_emit(emit)
+    mode = resolve_mode(mode)
+
+    # Scratch folders and frame numbering of this session (a fresh workspace if none is given)
+    if workspace is None:
+        workspace = workspaces.create()
+
+    # Counters and best frames carry over between requests of the same session
+    states = {task.name: (states or {}).get(task.name) or get_scan_state(workspace, task.name) for task in tasks}
+    trackers = {task.name: get_tracker(states[task.name]) if mode == 'track' else None for task in tasks}
+    gates = {task.name: gate_for(task) for task in tasks}
+    # Backend and input size of the predictions (`reference` unless the request or route asks for `fast`)
+    profiles = {task.name: resolve_profile(task.name, profile) for task in tasks}
+    models = {task.name: load_model(task, profiles[task.name]) for task in tasks}
+    deduplicator = get_deduplicator(workspace, tasks[0].name if len(tasks) == 1 else tuple(task.name for task in tasks))
+
+    def infer_all(executor, entries, rejections):
+        # Perform AI predictions for the whole batch in one call per model (keyframes only in track mode)
+        def infer_task(task):
+            return infer_batch(task, models[task.name], entries, profiles[task.name], workspace,
+                               trackers[task.name], rejections[task.name])
+
+        # All requested models work on the same decoded batch at the same time
+        futures = {task.name: submit(executor, infer_task, task) for task in tasks}
+        outputs = {}
+        for task_name, future in futures.items():
+            try:
+                results, keys = future.result()
+                # Annotation and encoding of this batch overlap the inference of the next one
+                outputs[task_name] = (render_batch(results, keys, image_policy), None)
+            except Exception as e:
+                outputs[task_name] = (None, str(e))
+        return outputs
+
+    def infer():
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='fan-out') if len(tasks) > 1 else None
+        try:
+            # Decode frames and run them through the models in batches (AI_BATCH_SIZE / AI_BATCH_MAX_WAIT)
+            for batch in iter_frame_batches(frames, batch_size, max_wait, workspace.next_frame_number):
+                # Near-duplicates of recent frames are not sent to the models
+                with stage_timer.stage('dedup'):
+                    entries = match_batch(batch, deduplicator)
+                # Blank and probe-off frames are not either; metrics are shared, each exam has its own thresholds
+                rejections = screen_batch(entries, gates)
+                yield entries, infer_all(executor, entries, rejections), rejections
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    # Inference runs on a background stage, at most `AI_STAGE_QUEUE` batches ahead of the results
+    with closing(staged(infer(), pipeline_depth(frames), 'inference')) as inferred:
+        for entries, outputs, rejections in inferred:
+            # Results come back in the same order as the batch
+            rendered_batches = {
+                task_name: (iter(rendered_batch or ()), batch_error)
+                for task_name, (rendered_batch, batch_error) in outputs.items()
+            }
+            for frame_number, _, decode_error, reference, duplicate in entries:
+                for task in tasks:
+                    rendered_batch, batch_error = rendered_batches[task.name]
+                    state = states[task.name]
+                    try:
+                        if decode_error is not None:
+                            raise ValueError(decode_error)
+                        if duplicate:
+                            frame_result, is_valid = reuse_result(task.name, reference, frame_number, state,
+                                                                  image_policy)
+                        elif frame_number in rejections[task.name]:
+                            frame_result, is_valid = reject_frame(task.name, frame_number,
+                                                                  *rejections[task.name][frame_number],
+                                                                  reference, state)
+                        elif batch_error is not None:
+                            raise RuntimeError(batch_error)
+                        else:
+                            result, cache_key, rendered = next(rendered_batch)
+                            frame_result, is_valid = analyse_reference(task.name, result, frame_number, reference,
+                                                                       state, workspace, response_mode,
+                                                                       image_policy, cache_key, rendered.result())
+                    except Exception as e:
+                        # Handle exceptions and provide debug information if needed
+                        frame_result = {
+                            'frame_number': frame_number,
+                            'error': str(e)
+                        }
+                        is_valid = True  # errors are always reported
+                    # Yield the analysis result for this frame (only valid frames in filtered mode)
+                    if emit == 'all' or is_valid:
+                        yield task.name, frame_result
+
+
+def run_task(task_name, frames, batch_size=None, max_wait=None, response_mode=None, image_policy=None,
+             workspace=None, state=None, profile=None, emit=None, mode=None):
+    """Analyse `frames` with the model of `task_name` and yield one result per frame (see `analyse_tasks`)."""
+    states = {task_name: state} if state is not None else None
+    for _, frame_result in analyse_tasks([task_name], frames, batch_size, max_wait, response_mode, image_policy,
+                                         workspace, states, profile, emit, mode):
+        yield frame_result
+
+
+def run_tasks(task_names, frames, batch_size=None, max_wait=None, response_mode=None, image_policy=None,
+              workspace=None, profile=None, emit=None, mode=None):
+    """Analyse `frames` with several exam models (see `analyse_tasks`); every result carries its `task` name."""
+    for task_name, frame_result in analyse_tasks(task_names, frames, batch_size, max_wait, response_mode,
+                                                 image_policy, workspace, None, profile, emit, mode):
+        frame_result['task'] = task_name
+        yield frame_result
@@ -0,0 +1,106 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Task table of the six ultrasound exams. Every exam route, model and class list is defined here
+# once; the detection pipeline, the model registry and the routes in `app.py` all read from it.
+#
+# Key Features:
+"""
+Each task (keyed by its route name) defines:
+- `model`         : Model folder name inside `weights/<trimester>/`.
+- `trimester`     : Trimester folder of the weights.
+- `model_path`    : Path of the YOLO weights (`weights/<trimester>/<model>/best.pt` inside the
+                    AI folder, or inside `AI_WEIGHTS_DIR`), built for the host's path separator.
+- `valid_classes` : Class names that count as a relevant detection for the exam.
+- `quality`       : Overrides of the quality gate thresholds (`min_mean`, `min_coverage`,
+                    `min_sharpness`, see `frameQuality.py`); the defaults apply otherwise.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# os                     : Weights paths for the host platform (plain configuration, safe to import
+#                          anywhere).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, CONFIGURATION)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+WEIGHTS_DIR = os.getenv('AI_WEIGHTS_DIR', os.path.join(base_dir, 'weights'))
+
+
+class ExamTask:
+    """One exam type: its route name, YOLO weights and relevant classes."""
+
+    def __init__(self, name, model, trimester, valid_classes, quality=None):
+        self.name = name
+        self.model = model
+        self.trimester = trimester
+        self.valid_classes = list(valid_classes)
+        self.quality = dict(quality or {})
+
+    @property
+    def model_path(self):
+        return os.path.join(WEIGHTS_DIR, self.trimester, self.model, 'best.pt')
+
+
+TASKS = {task.name: task for task in (
+    ExamTask(
+        "Placental-Detection", "Placenta_Position", "SecondTrimester",
+        ["baby", "feto", "placenta", "tip"],
+    ),
+    ExamTask(
+        "Fetus-Location", "Fetus_Location", "ThirdTrimester",
+        ["fetal skull", "abnormality"],
+    ),
+    ExamTask(
+        "Organ-Location", "Organ_Location", "ThirdTrimester",
+        ["CM", "IT", "NT", "midbrain", "nasal bone", "nasal skin", "nasal tip", "palate"],
+    ),
+    ExamTask(
+        "Organ-Assessment", "Organ_Assessment", "SecondTrimester",
+        ["Aorta", "Confluence", "Rib", "Spine", "Stomach"],
+    ),
+    ExamTask(
+        "Fetal-Echocardioghraphy", "Fetal_Echocardiography", "FirstTrimester",
+        ["Aorta", "Flows", "Other", "V sign"],
+        # The first-trimester heart fills a small, dark part of the frame
+        quality={"min_mean": 5, "min_coverage": 0.02},
+    ),
+    ExamTask(
+        "Fetal-Brain-Abnormality", "Fetal_Brain_Abnormality", "FirstTrimester",
+        [
+            "anold chiari malformation", "arachnoid cyst", "cerebellah hypoplasia", "cisterna magna",
+            "colphocephaly", "encephalocele", "holoprosencephaly", "hydracenphaly",
+            "intracranial hemorrdge", "intracranial tumor", "mild ventriculomegaly",
+            "moderate ventriculomegaly", "polencephaly", "severe ventriculomegaly",
+        ],
+    ),
+)}
+
+
+def get_task(task_name):
+    """Return the task for a route name, raising ValueError for unknown tasks."""
+    task = TASKS.get(task_name) if isinstance(task_name, str) else None
+    if task is None:
+        raise ValueError(f"Unknown task '{task_name}', expected one of {list(TASKS)}")
+    return task
+
+
+def parse_task_list(value):
+    """Task names from a JSON list or a comma-separated string, validated against the table."""
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(',') if name.strip()]
+    elif value is not None and not (isinstance(value, list) and all(isinstance(name, str) for name in value)):
+        raise ValueError("Tasks must be a list of task names or a comma-separated string")
+    if not value:
+        raise ValueError(f"No tasks given, expected some of {list(TASKS)}")
+    return [get_task(task_name).name for task_name in value]
@@ -0,0 +1,130 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Ultrasound fan-region crop. Screen recordings carry the machine UI, text overlays and black
+# borders around the ultrasound sector. The sector is located once per session (and frame size),
+# only that region is fed to the models, and the boxes are mapped back to full-frame coordinates,
+# so YOLO spends its input resolution on the scan itself.
+#
+# Key Features:
+"""
+Detection (once per session and frame size, on the first batch with usable frames):
+- Pixel-wise maximum of the batch, so a dark moment in one frame does not shrink the sector.
+- Echo-level threshold (`AI_QUALITY_ECHO_LEVEL`), a morphological open that removes UI text
+  strokes and a close that fills the speckle, then the largest external contour.
+- Its bounding rectangle plus a `AI_FAN_MARGIN` border (default 2% of the frame) is the crop.
+- No crop when the sector covers less than `AI_FAN_MIN_AREA` (default 10%) of the frame, or when
+  the crop would save less than `AI_FAN_MIN_SAVING` (default 10%) of the pixels.
+
+Inference:
+- `predict_batch` feeds `FanRegion.crop(image)` to the model and rebuilds every result on the full
+  frame with shifted boxes; annotation, storage, tracking and the `boxes` output are unchanged.
+- The region is part of the result cache key, as cached boxes are in full-frame coordinates.
+
+`AI_FAN_CROP=0` turns the crop off; `/sessions` reports the detected regions.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Thresholding, morphology and contours.
+# NumPy                  : Max projection of the batch.
+# Ultralytics / PyTorch  : Full-frame `Results` with shifted boxes (imported on use).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, IMAGE PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import threading
+import cv2
+import numpy as np
+from frameQuality import QualityConfig
+
+
+class RegionConfig:
+    ENABLED = os.getenv('AI_FAN_CROP', '1').lower() in ('1', 'true', 'yes')
+    MARGIN = float(os.getenv('AI_FAN_MARGIN', '0.02'))
+    MIN_AREA = float(os.getenv('AI_FAN_MIN_AREA', '0.1'))
+    MIN_SAVING = float(os.getenv('AI_FAN_MIN_SAVING', '0.1'))
+
+
+class FanRegion:
+    """Crop rectangle `(x1, y1, x2, y2)` of the ultrasound sector in frames of `shape`."""
+
+    def __init__(self, x1, y1, x2, y2, shape):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.shape = shape
+
+    def applies(self, image):
+        return image.shape == self.shape
+
+    @property
+    def variant(self):
+        """Part of the result cache key."""
+        return f'crop:{self.x1},{self.y1},{self.x2},{self.y2}'
+
+    def crop(self, image):
+        return np.ascontiguousarray(image[self.y1:self.y2, self.x1:self.x2])
+
+    def to_frame(self, result, image):
+        """Rebuild a result of the cropped frame on the full `image`, boxes shifted back."""
+        from ultralytics.engine.results import Results
+
+        data = result.boxes.data.clone()
+        data[:, :4] += data.new_tensor([self.x1, self.y1, self.x1, self.y1])
+        return Results(orig_img=image, path='', names=result.names, boxes=data)
+
+    def to_dict(self):
+        return {'x1': self.x1, 'y1': self.y1, 'x2': self.x2, 'y2': self.y2}
+
+
+def detect_fan_region(images):
+    """Locate the ultrasound sector in frames of one size; None when cropping would not help."""
+    gray = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image for image in images]
+    projection = np.maximum.reduce(gray) if len(gray) > 1 else gray[0]
+    height, width = projection.shape[:2]
+
+    mask = (projection >= QualityConfig.ECHO_LEVEL).astype(np.uint8) * 255
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5)))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (25, 25)))
+    contours = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[-2]
+    if not contours:
+        return None
+    sector = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(sector) < RegionConfig.MIN_AREA * height * width:
+        return None
+
+    x, y, w, h = cv2.boundingRect(sector)
+    margin_x, margin_y = round(RegionConfig.MARGIN * width), round(RegionConfig.MARGIN * height)
+    x1, y1 = max(0, x - margin_x), max(0, y - margin_y)
+    x2, y2 = min(width, x + w + margin_x), min(height, y + h + margin_y)
+    if (x2 - x1) * (y2 - y1) > (1 - RegionConfig.MIN_SAVING) * height * width:
+        return None
+    return FanRegion(x1, y1, x2, y2, images[0].shape)
+
+
+_regions_lock = threading.Lock()
+
+
+def get_fan_region(workspace, images):
+    """
+    Fan region of a session for frames the size of `images` (detected on first use).
+
+    Returns None when cropping is off, there are no frames yet, or the frames need no crop.
+    """
+    if not RegionConfig.ENABLED or not images:
+        return None
+    shape = images[0].shape
+    with _regions_lock:
+        if shape in workspace.fan_regions:
+            return workspace.fan_regions[shape]
+    same_size = [image for image in images if image.shape == shape]
+    region = detect_fan_region(same_size)
+    with _regions_lock:
+        return workspace.fan_regions.setdefault(shape, region)
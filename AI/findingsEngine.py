@@ -0,0 +1,246 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Findings engine behind `/generate-findings/`. Findings, abnormality details and recommendations
+# are computed from the structured detections the pipeline already produces (classes, boxes,
+# confidences per frame); no image is decoded or written. Statistics are running sums, so a
+# whole scan is summarised in well under a millisecond per class.
+#
+# Key Features:
+"""
+Inputs:
+- Frame results posted by the client, in the `full` or `compact` response format (frames with an
+  `error` or rejected by the quality gate are ignored). A `full` result without detections repeats
+  the classes and boxes of the last frame with detections; such frames are recognised by their
+  `num_placental` counter not increasing and counted without detections, or
+- The `FindingsAccumulator` of a session's scan state, fed by the pipeline with every analysed
+  frame (`ScanState.findings`).
+
+Per class statistics:
+- Frames the class was seen in (first / last frame), detections, confidence mean / min / max.
+- Mean box width, height and area, mean box centre and its spread (how stable the position is).
+
+Report (`report()`):
+- `findings`        : One sentence per detected class, most frequent first.
+- `tumor_details`   : Statistics of the abnormality classes (`ABNORMAL_CLASSES`) that were seen.
+- `recommendations` : Rule-based follow-up advice from the abnormalities, confidence levels and
+                      detection frequency.
+- `statistics`      : Frame counts and the full per-class table.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# math                   : Spread of the box centres.
+# Exam task table        : Valid and abnormality classes (`examTasks.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI RESULTS)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import math
+from examTasks import get_task
+
+# Brain findings other than normal anatomy, and the abnormality class of the fetus model
+ABNORMAL_CLASSES = frozenset(
+    [name for name in get_task("Fetal-Brain-Abnormality").valid_classes if name != "cisterna magna"]
+    + ["abnormality"]
+)
+HIGH_CONFIDENCE = 0.5
+LOW_CONFIDENCE = 0.4
+MIN_FRAMES = 3
+
+
+class ClassStats:
+    """Running statistics of the detections of one class."""
+
+    def __init__(self, class_name):
+        self.class_name = class_name
+        self.frames = 0
+        self.first_frame = None
+        self.last_frame = None
+        self._counted_frame = None  # frame whose first detection of this class was counted last
+        self.detections = 0
+        self.confidence_sum = 0.0
+        self.min_confidence = 1.0
+        self.max_confidence = 0.0
+        self.width_sum = 0.0
+        self.height_sum = 0.0
+        self.center_sum = [0.0, 0.0]
+        self.center_square_sum = [0.0, 0.0]
+
+    def add(self, frame_number, confidence, box):
+        if frame_number != self._counted_frame:
+            self.frames += 1
+            self._counted_frame = frame_number
+            self.first_frame = frame_number if self.first_frame is None else min(self.first_frame, frame_number)
+            self.last_frame = frame_number if self.last_frame is None else max(self.last_frame, frame_number)
+        self.detections += 1
+        self.confidence_sum += confidence
+        self.min_confidence = min(self.min_confidence, confidence)
+        self.max_confidence = max(self.max_confidence, confidence)
+        x1, y1, x2, y2 = box[:4]
+        self.width_sum += x2 - x1
+        self.height_sum += y2 - y1
+        for axis, center in enumerate(((x1 + x2) / 2, (y1 + y2) / 2)):
+            self.center_sum[axis] += center
+            self.center_square_sum[axis] += center * center
+
+    @property
+    def mean_confidence(self):
+        return self.confidence_sum / self.detections
+
+    def to_dict(self):
+        count = self.detections
+        center = [total / count for total in self.center_sum]
+        spread = math.sqrt(sum(
+            max(0.0, squares / count - mean * mean) for squares, mean in zip(self.center_square_sum, center)
+        ))
+        width, height = self.width_sum / count, self.height_sum / count
+        return {
+            'class_name': self.class_name,
+            'frames': self.frames,
+            'first_frame': self.first_frame,
+            'last_frame': self.last_frame,
+            'detections': count,
+            'mean_confidence': round(self.mean_confidence, 4),
+            'min_confidence': round(self.min_confidence, 4),
+            'max_confidence': round(self.max_confidence, 4),
+            'mean_box': {'width': round(width, 1), 'height': round(height, 1), 'area': round(width * height, 1)},
+            'mean_center': [round(value, 1) for value in center],
+            'center_spread': round(spread, 1),
+        }
+
+
+def frame_detections(frame_result):
+    """`(class_name, confidence, box)` of every box in a `full` or `compact` frame result."""
+    boxes = frame_result.get('boxes') or []
+    if 'class_names' in frame_result:
+        names = frame_result['class_names']
+        confidences = frame_result.get('confidences') or [0.0] * len(boxes)
+    else:
+        # The full format carries the classes of the frame and the confidence of its first box
+        names = frame_result.get('class_name') or []
+        if isinstance(names, str):
+            names = [names]
+        confidences = [float(frame_result.get('confidence') or 0.0)] * len(boxes)
+    return zip(names, confidences, boxes)
+
+
+class FindingsAccumulator:
+    """Detections of a scan, aggregated frame by frame."""
+
+    def __init__(self, valid_classes=()):
+        self.valid_classes = set(valid_classes)
+        self.frames = 0
+        self.frames_with_detections = 0
+        self.classes = {}
+        self._posted_count = 0  # last `num_placental` of the posted full-format results
+
+    def add(self, frame_number, detections):
+        """Count one frame and its `(class_name, confidence, box)` detections."""
+        self.frames += 1
+        found = False
+        for class_name, confidence, box in detections:
+            if self.valid_classes and class_name not in self.valid_classes:
+                continue
+            stats = self.classes.get(class_name)
+            if stats is None:
+                stats = self.classes[class_name] = ClassStats(class_name)
+            stats.add(frame_number, float(confidence), [float(value) for value in box])
+            found = True
+        self.frames_with_detections += found
+
+    def add_frame_result(self, frame_result, index=None):
+        """Count a posted frame result; errors and frames rejected by the quality gate are skipped."""
+        if 'error' in frame_result or frame_result.get('rejected'):
+            return
+        frame_number = frame_result.get('frame_number', index)
+        count = frame_result.get('num_placental')
+        if 'class_names' not in frame_result and isinstance(count, int):
+            # Full format: the counter only grows on frames with detections of their own
+            fresh = count > self._posted_count
+            self._posted_count = max(self._posted_count, count)
+            if not fresh:
+                self.add(frame_number, ())
+                return
+        self.add(frame_number, frame_detections(frame_result))
+
+    def report(self, task_name=None):
+        classes = sorted(self.classes.values(), key=lambda stats: (-stats.frames, stats.class_name))
+        table = [stats.to_dict() for stats in classes]
+        return {
+            'findings': findings_text(self, table, task_name),
+            'tumor_details': [entry for entry in table if entry['class_name'] in ABNORMAL_CLASSES],
+            'recommendations': recommendations(self, classes),
+            'statistics': {
+                'task': task_name,
+                'frames': self.frames,
+                'frames_with_detections': self.frames_with_detections,
+                'classes': table,
+            },
+        }
+
+
+def findings_text(accumulator, table, task_name):
+    exam = f" of the {task_name} exam" if task_name else ""
+    findings = [
+        f"{accumulator.frames} frames{exam} analysed, {accumulator.frames_with_detections} with relevant detections."
+    ]
+    for entry in table:
+        box = entry['mean_box']
+        center_x, center_y = entry['mean_center']
+        findings.append(
+            f"{entry['class_name']}: seen in {entry['frames']} of {accumulator.frames} frames "
+            f"(frames {entry['first_frame']}-{entry['last_frame']}), mean confidence "
+            f"{entry['mean_confidence']:.0%}, max {entry['max_confidence']:.0%}; typical size "
+            f"{box['width']:.0f}x{box['height']:.0f} px centred at ({center_x:.0f}, {center_y:.0f})."
+        )
+    return findings
+
+
+def recommendations(accumulator, classes):
+    if not classes:
+        return [
+            "No relevant structures were detected in the analysed frames; repeat the acquisition with an "
+            "adjusted probe position.",
+        ]
+
+    advice = []
+    abnormal = [stats for stats in classes if stats.class_name in ABNORMAL_CLASSES]
+    confirmed = [stats for stats in abnormal if stats.max_confidence >= HIGH_CONFIDENCE]
+    possible = [stats for stats in abnormal if stats.max_confidence < HIGH_CONFIDENCE]
+    if confirmed:
+        advice.append("Specialist review recommended for: " + ", ".join(
+            f"{stats.class_name} ({stats.frames} frames, max confidence {stats.max_confidence:.0%})"
+            for stats in confirmed
+        ) + ".")
+    if possible:
+        advice.append("Possible " + ", ".join(stats.class_name for stats in possible)
+                      + " with low confidence; review the frames and consider a follow-up scan.")
+
+    uncertain = [
+        stats.class_name for stats in classes
+        if stats.class_name not in ABNORMAL_CLASSES
+        and (stats.frames < MIN_FRAMES or stats.mean_confidence < LOW_CONFIDENCE)
+    ]
+    if uncertain:
+        advice.append("Confirm " + ", ".join(uncertain) + " on additional views (few frames or low confidence).")
+
+    advice.append("Correlate with the clinical history, maternal conditions and previous scans.")
+    return advice
+
+
+def generate_findings(frame_results, task_name=None):
+    """Findings report of posted frame results (restricted to the exam's valid classes with a task)."""
+    accumulator = FindingsAccumulator(get_task(task_name).valid_classes if task_name else ())
+    for index, frame_result in enumerate(frame_results):
+        if not isinstance(frame_result, dict):
+            raise ValueError("Every frame must be a frame result object")
+        accumulator.add_frame_result(frame_result, index)
+    return accumulator.report(task_name)
@@ -0,0 +1,159 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module decodes incoming frames and groups them into batches so the detection modules can
+# run one YOLO call per batch instead of one call per image.
+#
+# Key Features:
+"""
+Frame Decoding:
+- Converts base64 data-URL frames into OpenCV (BGR) images.
+- Decodes raw JPEG/PNG bytes sent through the binary transports (see `binaryTransport.py`).
+- Passes through frames that were already decoded on the server (see `videoIngestion.py`).
+- Reports frames that fail to decode instead of stopping the whole request.
+- Decodes in the shared decode pool (`AI_DECODE_WORKERS`, see `stagedPipeline.py`) and reads
+  video / job frame sources ahead on a background thread, so decoding overlaps inference.
+
+Batching:
+- Groups decoded frames into batches of `AI_BATCH_SIZE` frames (default 8).
+- Flushes a partial batch `AI_BATCH_MAX_WAIT` seconds (default 0.05) after its first frame,
+  even while the frame source is stalled, so slow sources still stream results promptly.
+- Keeps the original frame order so results can be yielded frame by frame.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Image decoding.
+# NumPy                  : Wraps decoded bytes for OpenCV.
+# Base64                 : Decodes data-URL frames.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, IMAGE PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import time
+import queue
+import base64
+import cv2
+import numpy as np
+from stageTimer import stage_timer, frame_taken
+from stagedPipeline import StageConfig, ReadAhead, submit, decode_pool
+
+
+class BatchConfig:
+    BATCH_SIZE = int(os.getenv('AI_BATCH_SIZE', '8'))
+    MAX_WAIT_SECONDS = float(os.getenv('AI_BATCH_MAX_WAIT', '0.05'))
+
+
+def resolve_batching(batch_size=None, max_wait=None):
+    """Validate per-request batching overrides; None (or empty) keeps the configured default."""
+    try:
+        batch_size = None if batch_size in (None, '') else int(batch_size)
+        max_wait = None if max_wait in (None, '') else float(max_wait)
+    except (TypeError, ValueError):
+        raise ValueError("batch_size must be an integer and max_wait a number of seconds")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if max_wait is not None and not max_wait >= 0:
+        raise ValueError("max_wait must not be negative")
+    return batch_size, max_wait
+
+
+def decode_frame(frame_data):
+    """Decode a base64 data-URL frame or raw encoded image bytes into a BGR image."""
+    # Frames decoded on the server (e.g. from a video) are already images
+    if isinstance(frame_data, np.ndarray):
+        return frame_data
+
+    if isinstance(frame_data, (bytes, bytearray, memoryview)):
+        # Raw encoded image bytes (multipart / binary transport) are decoded in place
+        np_img = np.frombuffer(frame_data, dtype=np.uint8)
+    else:
+        img_data = base64.b64decode(frame_data.split(",")[1])
+        np_img = np.frombuffer(img_data, dtype=np.uint8)
+    frame = cv2.imdecode(np_img, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Frame could not be decoded as an image")
+    return frame
+
+
+def timed_decode(frame_data):
+    with stage_timer.stage('decode'):
+        return decode_frame(frame_data)
+
+
+def collect_batch(pending):
+    """Wait for the decodes of a batch: `(frame_number, image, error)` tuples in frame order."""
+    batch = []
+    for frame_number, decoded in pending:
+        try:
+            batch.append((frame_number, decoded.result(), None))
+        except Exception as e:
+            batch.append((frame_number, None, str(e)))
+    return batch
+
+
+def iter_frame_batches(frames, batch_size=None, max_wait=None, next_frame_number=None):
+    """
+    Decode `frames` and yield them in batches.
+
+    Each batch is a list of `(frame_number, image, error)` tuples in frame order. `image` is None
+    and `error` holds the message when a frame could not be decoded. Frame numbers start at 0
+    unless `next_frame_number` (e.g. `Workspace.next_frame_number`) hands them out.
+    """
+    batch_size = max(1, int(batch_size or BatchConfig.BATCH_SIZE))
+    max_wait = BatchConfig.MAX_WAIT_SECONDS if max_wait is None else float(max_wait)
+
+    # Lazy sources (video decoding, stored job frames) are read ahead on a background thread
+    depth = 0 if isinstance(frames, (list, tuple)) else batch_size * StageConfig.QUEUE_DEPTH
+    source = ReadAhead(frames, depth, 'frame-source')
+    pool = decode_pool()
+
+    batch = []
+    deadline = None
+    counter = 0
+
+    try:
+        while True:
+            # A partial batch waits for the source at most until `max_wait` after its first frame
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                frame_data = source.get(timeout)
+            except StopIteration:
+                break
+            except queue.Empty:
+                yield collect_batch(batch)
+                batch = []
+                continue
+
+            if next_frame_number is not None:
+                frame_number = next_frame_number()
+            else:
+                frame_number = counter
+                counter += 1
+            frame_taken(frame_number)
+
+            # Decoding runs in the pool; frames already decoded on the server skip the round trip
+            if isinstance(frame_data, np.ndarray):
+                batch.append((frame_number, submit(None, decode_frame, frame_data)))
+            else:
+                batch.append((frame_number, submit(pool, timed_decode, frame_data)))
+            if len(batch) == 1:
+                deadline = time.monotonic() + max_wait
+
+            if len(batch) >= batch_size or time.monotonic() >= deadline:
+                yield collect_batch(batch)
+                batch = []
+
+        if batch:
+            yield collect_batch(batch)
+    finally:
+        # Stops the read-ahead thread when the consumer goes away early
+        source.close()
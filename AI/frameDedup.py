@@ -0,0 +1,111 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Near-duplicate frame elimination ahead of inference. Consecutive ultrasound frames sampled at up
+# to 30 fps are often almost identical; such frames reuse the detections of the earlier frame
+# instead of going through YOLO, annotation, encoding and storage again.
+#
+# Key Features:
+"""
+Similarity check:
+- Every decoded frame is reduced to a small grayscale thumbnail (`AI_DEDUP_SIZE`, default 16x16).
+- A frame is a duplicate when the mean absolute difference of its thumbnail to one of the last
+  `AI_DEDUP_WINDOW` inferred frames (default 4) is at most `AI_DEDUP_THRESHOLD` grey levels
+  (default 2.0). A threshold of 0 disables the check.
+- Duplicates are only compared against inferred frames, so a slow drift is never chained across
+  many skipped frames.
+- References keep their results without the annotated image; a skipped frame gets the image of
+  its reference back from the result cache while it is cached, and none otherwise.
+
+The deduplicator lives in the session workspace, so it also works for frames arriving one by one
+over the scan WebSocket.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Grayscale thumbnails.
+# NumPy                  : Thumbnail differences.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, IMAGE PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import threading
+from collections import deque
+import cv2
+import numpy as np
+
+
+class DedupConfig:
+    THRESHOLD = float(os.getenv('AI_DEDUP_THRESHOLD', '2.0'))
+    WINDOW = int(os.getenv('AI_DEDUP_WINDOW', '4'))
+    SIZE = int(os.getenv('AI_DEDUP_SIZE', '16'))
+
+
+def frame_signature(image, size=None):
+    """Small grayscale thumbnail of a BGR frame, used for the similarity check."""
+    size = size or DedupConfig.SIZE
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    return cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+class ReferenceFrame:
+    """An inferred frame that later duplicates can reuse; `results` is filled once it is analysed."""
+
+    def __init__(self, frame_number, signature):
+        self.frame_number = frame_number
+        self.signature = signature
+        self.results = {}  # task name -> (frame result without image, has detections, is valid, cache key)
+
+
+class FrameDeduplicator:
+    """Recent inferred frames of one scan, matched against new frames before inference."""
+
+    def __init__(self, threshold=None, window=None):
+        self.threshold = DedupConfig.THRESHOLD if threshold is None else float(threshold)
+        self.window = window or DedupConfig.WINDOW
+        self.skipped = 0
+        self._references = deque(maxlen=self.window)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def match(self, frame_number, image):
+        """
+        Return `(reference, is_duplicate)` for a decoded frame.
+
+        A duplicate gets the earlier reference frame it matched. Any other frame becomes a new
+        reference, whose `results` the caller fills in after inference.
+        """
+        signature = frame_signature(image)
+        with self._lock:
+            for reference in reversed(self._references):
+                if float(np.mean(np.abs(signature - reference.signature))) <= self.threshold:
+                    self.skipped += 1
+                    return reference, True
+            reference = ReferenceFrame(frame_number, signature)
+            self._references.append(reference)
+            return reference, False
+
+
+def get_deduplicator(workspace, key):
+    """Deduplicator of one scan (`key` is the task name or tuple of task names) in a workspace."""
+    return workspace.deduplicators.setdefault(key, FrameDeduplicator())
+
+
+def duplicate_result(reference_result, frame_number, reference_frame_number):
+    """Result of a skipped frame: the reference frame's detections under the new frame number."""
+    frame_result = dict(reference_result)
+    frame_result['frame_number'] = frame_number
+    frame_result['skipped'] = True
+    frame_result['duplicate_of'] = reference_frame_number
+    return frame_result
@@ -0,0 +1,92 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Pre-inference quality gate. Long recordings contain stretches where the probe is lifted or the
+# screen is (nearly) black; such frames are measured with a few cheap image statistics and kept
+# away from the models. They are still reported in the stream, with the reason they were rejected.
+#
+# Key Features:
+"""
+Metrics (on a grayscale thumbnail `AI_QUALITY_SIZE` pixels wide, default 160):
+- `mean`      : Mean intensity. Black or blank frames score near 0.
+- `sharpness` : Variance of the Laplacian. Featureless frames (no tissue speckle) score low.
+- `coverage`  : Share of pixels at or above the echo level `AI_QUALITY_ECHO_LEVEL` (default 24),
+                i.e. how much of the frame the ultrasound fan fills. A lifted probe leaves only
+                the machine UI lit.
+
+Rejection reasons, checked in this order:
+- `blank`      : `mean` below `AI_QUALITY_MIN_MEAN` (default 8).
+- `probe_off`  : `coverage` below `AI_QUALITY_MIN_COVERAGE` (default 0.05).
+- `no_texture` : `sharpness` below `AI_QUALITY_MIN_SHARPNESS` (default 10).
+
+Exams can override the thresholds in their task table entry (`quality` in `examTasks.py`).
+Frozen screens are repeats of an earlier frame and are already skipped by `frameDedup.py`.
+`AI_QUALITY_GATE=0` turns the gate off.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Thumbnail, grayscale conversion and Laplacian.
+# NumPy                  : Vectorised statistics.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, IMAGE PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import cv2
+import numpy as np
+
+
+class QualityConfig:
+    ENABLED = os.getenv('AI_QUALITY_GATE', '1').lower() in ('1', 'true', 'yes')
+    SIZE = int(os.getenv('AI_QUALITY_SIZE', '160'))
+    ECHO_LEVEL = int(os.getenv('AI_QUALITY_ECHO_LEVEL', '24'))
+    MIN_MEAN = float(os.getenv('AI_QUALITY_MIN_MEAN', '8'))
+    MIN_COVERAGE = float(os.getenv('AI_QUALITY_MIN_COVERAGE', '0.05'))
+    MIN_SHARPNESS = float(os.getenv('AI_QUALITY_MIN_SHARPNESS', '10'))
+
+
+def frame_quality(image):
+    """Quality metrics of a BGR frame: mean intensity, Laplacian variance and fan coverage."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    height, width = gray.shape[:2]
+    if width > QualityConfig.SIZE:
+        size = (QualityConfig.SIZE, max(1, round(height * QualityConfig.SIZE / width)))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return {
+        'mean': round(float(gray.mean()), 2),
+        'sharpness': round(float(cv2.Laplacian(gray, cv2.CV_32F).var()), 2),
+        'coverage': round(float(np.count_nonzero(gray >= QualityConfig.ECHO_LEVEL)) / gray.size, 4),
+    }
+
+
+class QualityGate:
+    """Thresholds of one exam; `check` names the reason a frame is rejected (None when it passes)."""
+
+    def __init__(self, min_mean=None, min_coverage=None, min_sharpness=None):
+        self.min_mean = QualityConfig.MIN_MEAN if min_mean is None else min_mean
+        self.min_coverage = QualityConfig.MIN_COVERAGE if min_coverage is None else min_coverage
+        self.min_sharpness = QualityConfig.MIN_SHARPNESS if min_sharpness is None else min_sharpness
+
+    def check(self, metrics):
+        if metrics['mean'] < self.min_mean:
+            return 'blank'
+        if metrics['coverage'] < self.min_coverage:
+            return 'probe_off'
+        if metrics['sharpness'] < self.min_sharpness:
+            return 'no_texture'
+        return None
+
+
+def gate_for(task):
+    """Quality gate of an exam task, or None when the gate is turned off."""
+    if not QualityConfig.ENABLED:
+        return None
+    return QualityGate(**task.quality)
@@ -0,0 +1,78 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Server-side selection of report frames. The service filters detections against the valid class
+# table of each exam (`examTasks.py`) and keeps streaming top-K heaps of the best frames, overall and
+# per class, so clients no longer keep every annotated frame just to pick the two best ones.
+#
+# Key Features:
+"""
+Filtering:
+- A frame is valid when it contains at least one detection of a valid class of the exam.
+- `emit=filtered` streams only valid frames (and errors) and ends the stream with a summary event
+  holding the best frames; `emit=all` (default) streams every frame as before.
+
+Top-K:
+- `TopK` is a bounded min-heap: each new frame costs O(log K) and only K frames are retained.
+- The scan state keeps the `AI_BEST_FRAMES` (default 2) most confident valid frames overall and
+  per valid class.
+- Only the detection fields of a frame are retained, never its annotated image; the summary adds
+  the image back from the result cache while it is still cached.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# heapq                  : Bounded min-heaps of the best frames.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import heapq
+
+EMIT_MODES = ('all', 'filtered')
+
+
+def resolve_emit(emit=None):
+    """Validate the requested emit mode, defaulting to `all`."""
+    emit = emit or 'all'
+    if emit not in EMIT_MODES:
+        raise ValueError(f"Unknown emit mode '{emit}', expected one of {EMIT_MODES}")
+    return emit
+
+
+def class_confidences(result, valid_classes):
+    """Highest confidence of every valid class detected in an ultralytics result."""
+    boxes = result.boxes
+    confidences = {}
+    for class_id, confidence in zip(boxes.cls.int().tolist(), boxes.conf.tolist()):
+        class_name = result.names[class_id]
+        if valid_classes and class_name not in valid_classes:
+            continue
+        confidences[class_name] = max(confidence, confidences.get(class_name, 0.0))
+    return confidences
+
+
+class TopK:
+    """The `limit` highest-scoring items seen so far."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._heap = []  # min-heap of (score, frame_number, item)
+
+    def push(self, score, frame_number, item):
+        entry = (score, frame_number, item)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        """Items from best to worst."""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: -entry[0])]
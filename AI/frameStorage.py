@@ -0,0 +1,144 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module saves annotated frames to disk in the background. The detection modules hand their
+# frames to a bounded writer queue instead of calling `cv2.imwrite` on the request thread, so JPEG
+# encoding and file system writes are no longer part of the inference latency.
+#
+# Key Features:
+"""
+Storage Modes (`AI_FRAME_STORAGE`):
+- `all`        : Store every annotated frame (previous behaviour, default).
+- `detections` : Store only frames with at least one detection.
+- `off`        : Do not store frames at all.
+
+Background Writer:
+- One daemon thread drains a queue of at most `AI_FRAME_WRITER_QUEUE` frames (default 64).
+- When the queue is full, `submit` waits up to `AI_FRAME_WRITER_BLOCK` seconds (default 0.1)
+  and then drops the frame, so memory stays bounded and a slow disk cannot stall inference.
+- Backpressure metrics (queue depth, blocked time, dropped frames, write time) are exposed
+  through `stats()` and the `/frame-storage` endpoint.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : JPEG encoding and writing of frames.
+# queue / threading      : Bounded hand-off to the background writer thread.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, FILE STORAGE)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import time
+import queue
+import threading
+import cv2
+
+STORAGE_MODES = ('off', 'detections', 'all')
+
+
+class StorageConfig:
+    MODE = os.getenv('AI_FRAME_STORAGE', 'all').lower()
+    QUEUE_SIZE = int(os.getenv('AI_FRAME_WRITER_QUEUE', '64'))
+    BLOCK_SECONDS = float(os.getenv('AI_FRAME_WRITER_BLOCK', '0.1'))
+
+
+class FrameWriter:
+    """Background writer for annotated frames with a bounded queue."""
+
+    def __init__(self, mode, queue_size, block_seconds):
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown frame storage mode '{mode}', expected one of {STORAGE_MODES}")
+        self.mode = mode
+        self.block_seconds = block_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'errors': 0,
+            'blocked_seconds': 0.0,
+            'write_seconds': 0.0,
+            'max_queue_depth': 0,
+        }
+
+    def wants(self, has_detections):
+        """Whether a frame with (or without) detections would be stored in the current mode."""
+        return self.mode == 'all' or (self.mode == 'detections' and has_detections)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='frame-writer', daemon=True)
+                    self._thread.start()
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def submit(self, path, frame, has_detections):
+        """Queue `frame` to be written to `path`. Returns False if it was skipped or dropped."""
+        if frame is None or not self.wants(has_detections):
+            return False
+
+        self._ensure_started()
+        start = time.perf_counter()
+        try:
+            self._queue.put((path, frame), timeout=self.block_seconds)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        finally:
+            self._count('blocked_seconds', time.perf_counter() - start)
+
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+        return True
+
+    def _run(self):
+        while True:
+            path, frame = self._queue.get()
+            start = time.perf_counter()
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                if cv2.imwrite(path, frame):
+                    self._count('written')
+                else:
+                    self._count('errors')
+            except Exception:
+                self._count('errors')
+            finally:
+                self._count('write_seconds', time.perf_counter() - start)
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued frame has been written."""
+        self._queue.join()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['blocked_seconds'] = round(stats['blocked_seconds'], 4)
+        stats['write_seconds'] = round(stats['write_seconds'], 4)
+        stats.update({
+            'mode': self.mode,
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+        })
+        return stats
+
+
+# Shared writer used by all detection modules
+frame_writer = FrameWriter(StorageConfig.MODE, StorageConfig.QUEUE_SIZE, StorageConfig.BLOCK_SECONDS)
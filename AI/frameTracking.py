@@ -0,0 +1,278 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Detect-and-track mode. Consecutive ultrasound frames show the same structures, so with
+# `mode=track` the YOLO model only runs on keyframes; the frames in between get their boxes from
+# sparse optical flow. Every tracked object keeps a stable ID for the whole scan, which gives a
+# "placenta seen in frames X-Y" summary instead of per-frame detections.
+#
+# Key Features:
+"""
+Keyframes:
+- Every `AI_TRACK_INTERVAL`-th frame (default 5) goes through the detector.
+- So does a frame whose thumbnail differs from the last keyframe by more than
+  `AI_TRACK_SCENE_CHANGE` (mean absolute grey-level difference, default 12), e.g. a probe move.
+- A frame is re-detected when any tracked box loses more than half of its flow points or its
+  confidence decays below `AI_TRACK_MIN_CONFIDENCE` (default 0.15).
+
+Tracking:
+- Boxes follow the median Lucas-Kanade flow of corner points inside them (forward-backward checked).
+- A tracked box keeps its class; its confidence is the keyframe confidence times the share of
+  surviving points and `AI_TRACK_DECAY` (default 0.95) per frame.
+- On a keyframe, detections take over the IDs of the tracks they overlap (same class, IoU >= 0.3);
+  new objects get new IDs.
+- Results are ultralytics `Results` with track IDs, so annotation, storage and both response
+  formats work unchanged. Frame results gain `track_ids` and `keyframe`.
+
+Summary:
+- `summary()` lists every track with its class, first / last frame, frame count and best confidence,
+  plus the number of keyframes, tracked frames and re-detections.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Corner detection and pyramidal Lucas-Kanade optical flow.
+# NumPy                  : Box arithmetic and IoU matching.
+# Ultralytics / PyTorch  : `Results` objects of tracked frames (imported on use).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import threading
+import cv2
+import numpy as np
+from frameDedup import frame_signature
+
+ANALYSIS_MODES = ('detect', 'track')
+
+LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                 criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+
+class TrackConfig:
+    INTERVAL = int(os.getenv('AI_TRACK_INTERVAL', '5'))
+    SCENE_CHANGE = float(os.getenv('AI_TRACK_SCENE_CHANGE', '12.0'))
+    MIN_CONFIDENCE = float(os.getenv('AI_TRACK_MIN_CONFIDENCE', '0.15'))
+    DECAY = float(os.getenv('AI_TRACK_DECAY', '0.95'))
+    MATCH_IOU = 0.3
+    MAX_POINTS = 40
+    MIN_POINTS = 4
+    MAX_FLOW_ERROR = 1.0  # pixels, forward-backward
+
+
+def resolve_mode(mode=None):
+    """Validate the requested analysis mode, defaulting to `detect` (every frame)."""
+    mode = mode or 'detect'
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {ANALYSIS_MODES}")
+    return mode
+
+
+def box_iou(boxes_a, boxes_b):
+    """IoU matrix of two `(N, 4)` / `(M, 4)` xyxy box arrays."""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)))
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return intersection / (area_a[:, None] + area_b[None, :] - intersection + 1e-9)
+
+
+def to_gray(image):
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def track_fields(result):
+    """Extra frame-result fields of a tracked result (none for plain detections)."""
+    if not hasattr(result, 'keyframe'):
+        return {}
+    return {'track_ids': result.boxes.id.int().tolist(), 'keyframe': result.keyframe}
+
+
+class FrameTracker:
+    """Tracks the detections of one exam across the frames of a scan."""
+
+    def __init__(self, interval=None, scene_change=None, min_confidence=None, decay=None):
+        self.interval = max(1, interval or TrackConfig.INTERVAL)
+        self.scene_change = TrackConfig.SCENE_CHANGE if scene_change is None else scene_change
+        self.min_confidence = TrackConfig.MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.decay = TrackConfig.DECAY if decay is None else decay
+        self.keyframes = 0
+        self.tracked_frames = 0
+        self.redetections = 0
+        self.lock = threading.Lock()
+
+        self._names = {}
+        self._gray = None        # previous frame
+        self._signature = None   # thumbnail of the last keyframe
+        self._since_keyframe = 0
+        self._boxes = np.zeros((0, 4), np.float32)
+        self._confidences = np.zeros(0, np.float32)
+        self._classes = np.zeros(0, np.int64)
+        self._ids = np.zeros(0, np.int64)
+        self._next_id = 1
+        self._spans = {}  # track id -> span of frames the object was seen in
+
+    def plan(self, images):
+        """Which of the next `images` are keyframes: by schedule, at a scene change or to start."""
+        keyframes = []
+        since, signature = self._since_keyframe, self._signature
+        for image in images:
+            current = frame_signature(image)
+            keyframe = (
+                signature is None
+                or since + 1 >= self.interval
+                or float(np.abs(current - signature).mean()) > self.scene_change
+            )
+            if keyframe:
+                since, signature = 0, current
+            else:
+                since += 1
+            keyframes.append(keyframe)
+        return keyframes
+
+    def observe(self, frame_number, image, result, redetection=False):
+        """Take over the detections of a keyframe; returns them as a result with track IDs."""
+        data = result.boxes.data.cpu().numpy()
+        boxes = data[:, :4].astype(np.float32)
+        classes = data[:, -1].astype(np.int64)
+        gray = to_gray(image)
+
+        # Carry the current tracks up to this frame, then hand their IDs to overlapping detections
+        previous = self._flow(gray)[0] if self._can_follow(gray) and len(self._boxes) else self._boxes[:0]
+        self._ids = self._associate(previous, boxes, classes)
+        self._boxes = boxes
+        self._confidences = data[:, -2].astype(np.float32)
+        self._classes = classes
+        self._names = dict(result.names)
+        self._gray = gray
+        self._signature = frame_signature(image)
+        self._since_keyframe = 0
+        self.keyframes += 1
+        self.redetections += redetection
+        self._record(frame_number)
+        return self._result(image, keyframe=True)
+
+    def propagate(self, frame_number, image):
+        """Boxes of an intermediate frame from optical flow, or None when it must be re-detected."""
+        gray = to_gray(image)
+        if not self._can_follow(gray):
+            return None
+        if len(self._boxes):
+            boxes, survival = self._flow(gray)
+            confidences = self._confidences * survival * self.decay
+            if (survival < 0.5).any() or confidences.min() < self.min_confidence:
+                return None
+            self._boxes, self._confidences = boxes, confidences
+        self._gray = gray
+        self._since_keyframe += 1
+        self.tracked_frames += 1
+        self._record(frame_number)
+        return self._result(image, keyframe=False)
+
+    def _can_follow(self, gray):
+        # A new video of another size in the same session starts over from a keyframe
+        return self._gray is not None and self._gray.shape == gray.shape
+
+    def _flow(self, gray):
+        """Track the corner points of every box into `gray`: moved boxes and share of surviving points."""
+        points, owners = [], []
+        for index, (x1, y1, x2, y2) in enumerate(self._boxes.astype(int)):
+            mask = np.zeros_like(self._gray)
+            mask[max(y1, 0):max(y2, 0), max(x1, 0):max(x2, 0)] = 255
+            found = cv2.goodFeaturesToTrack(self._gray, TrackConfig.MAX_POINTS, 0.01, 5, mask=mask)
+            if found is not None:
+                points.append(found)
+                owners.append(np.full(len(found), index))
+
+        boxes = self._boxes.copy()
+        survival = np.zeros(len(boxes), np.float32)
+        if not points:
+            return boxes, survival
+
+        points = np.concatenate(points).astype(np.float32)
+        owners = np.concatenate(owners)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self._gray, gray, points, None, **LK_PARAMS)
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._gray, moved, None, **LK_PARAMS)
+        error = np.linalg.norm((points - back).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (error < TrackConfig.MAX_FLOW_ERROR)
+        shift = (moved - points).reshape(-1, 2)
+
+        for index in range(len(boxes)):
+            kept = good & (owners == index)
+            if kept.sum() < TrackConfig.MIN_POINTS:
+                continue  # too few points to follow the box: survival stays 0
+            survival[index] = kept.sum() / (owners == index).sum()
+            dx, dy = np.median(shift[kept], axis=0)
+            boxes[index] += (dx, dy, dx, dy)
+
+        height, width = gray.shape[:2]
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width)
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height)
+        return boxes, survival
+
+    def _associate(self, previous, boxes, classes):
+        """Track IDs of new detections: greedy IoU matching with the current tracks of the same class."""
+        ids = np.zeros(len(boxes), np.int64)
+        iou = box_iou(boxes, previous)
+        if iou.size:
+            iou[classes[:, None] != self._classes[None, :]] = 0
+            used = set()
+            for index in np.argsort(-iou, axis=None):
+                detection, track = np.unravel_index(index, iou.shape)
+                if iou[detection, track] < TrackConfig.MATCH_IOU:
+                    break
+                if ids[detection] or track in used:
+                    continue
+                ids[detection] = self._ids[track]
+                used.add(track)
+        for detection in np.flatnonzero(ids == 0):
+            ids[detection] = self._next_id
+            self._next_id += 1
+        return ids
+
+    def _record(self, frame_number):
+        for track_id, class_id, confidence in zip(self._ids.tolist(), self._classes.tolist(),
+                                                  self._confidences.tolist()):
+            span = self._spans.get(track_id)
+            if span is None:
+                span = self._spans[track_id] = {
+                    'track_id': track_id,
+                    'class_name': self._names.get(class_id, str(class_id)),
+                    'first_frame': frame_number,
+                    'last_frame': frame_number,
+                    'frames': 0,
+                    'max_confidence': 0.0,
+                }
+            span['last_frame'] = frame_number
+            span['frames'] += 1
+            span['max_confidence'] = max(span['max_confidence'], round(confidence, 4))
+
+    def _result(self, image, keyframe):
+        import torch
+        from ultralytics.engine.results import Results
+
+        # xyxy, track id, confidence, class: the layout ultralytics uses for tracked boxes
+        data = np.column_stack([self._boxes, self._ids, self._confidences, self._classes]).astype(np.float32)
+        result = Results(orig_img=image, path='', names=self._names, boxes=torch.from_numpy(data.reshape(-1, 7)))
+        result.keyframe = keyframe
+        return result
+
+    def summary(self):
+        return {
+            'keyframes': self.keyframes,
+            'tracked_frames': self.tracked_frames,
+            'redetections': self.redetections,
+            'tracks': sorted((dict(span) for span in list(self._spans.values())),
+                             key=lambda span: (span['first_frame'], span['track_id'])),
+        }
@@ -0,0 +1,139 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Import-time report of the AI backend. Every module is imported in a fresh interpreter with
+# `python -X importtime`, so cold-start regressions can be tracked per module.
+#
+# Usage:
+"""
+    python importReport.py                         # table for all AI backend modules
+    python importReport.py app detectionPipeline   # selected modules only
+    python importReport.py --json imports.json     # also write a machine-readable report
+    python importReport.py --baseline imports.json --tolerance 0.2
+                                                   # exit code 1 if a module got >20% slower
+
+For each module the report lists the cumulative import time and the heaviest packages it pulls in.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# subprocess             : Fresh interpreter per module (no shared import cache).
+# argparse / json        : Command line and report file.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, TOOLING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Differences below this are measurement noise, not regressions
+MIN_REGRESSION_SECONDS = 0.01
+
+# Modules on the request path of the service, in dependency order
+DEFAULT_MODULES = [
+    'examTasks', 'stageTimer', 'metrics', 'stagedPipeline', 'frameBatching', 'binaryTransport',
+    'resultEncoding', 'frameStorage', 'workspaces', 'frameDedup', 'frameQuality', 'fanRegion',
+    'frameTracking', 'resultCache', 'frameSelection', 'videoIngestion', 'inferenceBackends',
+    'modelRegistry', 'findingsEngine', 'requestOptions', 'detectionPipeline', 'jobQueue', 'app',
+]
+
+
+def measure_module(module, top=5):
+    """Import `module` in a fresh interpreter and return its import timings in seconds."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=AI_DIR, capture_output=True, text=True,
+        # Keep the measurement free of model loading and other startup side effects
+        env={**os.environ, 'AI_MODEL_LOADING': 'lazy'},
+    )
+    if completed.returncode != 0:
+        return {'module': module, 'error': completed.stderr.strip().splitlines()[-1:]}
+
+    # Lines are "import time: <self us> | <cumulative us> | <indented package name>", children
+    # before parents; top-level entries before the module belong to interpreter startup
+    subtree = []
+    cumulative = 0.0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, raw_name = line[len('import time:'):].split('|')
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        name = raw_name.strip()
+        seconds = int(cumulative_us) / 1e6
+        if depth > 0:
+            # Nested import of the next top-level entry
+            subtree.append((depth, name, seconds))
+        elif name == module:
+            cumulative = seconds
+            break
+        else:
+            subtree = []
+
+    # Direct dependencies of the module (one indentation level below it)
+    direct = [(name, seconds) for depth, name, seconds in subtree if depth == 1]
+    heaviest = sorted(direct, key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'cumulative_seconds': round(cumulative, 4),
+        'heaviest_imports': [{'package': name, 'seconds': round(seconds, 4)} for name, seconds in heaviest],
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Return the modules whose import time grew by more than `tolerance` (a fraction)."""
+    previous = {entry['module']: entry for entry in baseline.get('modules', [])}
+    regressions = []
+    for entry in report['modules']:
+        before = previous.get(entry['module'], {}).get('cumulative_seconds')
+        after = entry.get('cumulative_seconds')
+        if before and after and after > before * (1 + tolerance) and after - before > MIN_REGRESSION_SECONDS:
+            regressions.append({'module': entry['module'], 'baseline_seconds': before, 'seconds': after})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import-time report of the AI backend")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--top', type=int, default=5, help="heaviest imports listed per module")
+    parser.add_argument('--json', dest='json_path', help="write the report to this file")
+    parser.add_argument('--baseline', help="earlier report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown vs. the baseline")
+    args = parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'modules': [measure_module(m, args.top) for m in args.modules]}
+
+    for entry in report['modules']:
+        if 'error' in entry:
+            print(f"{entry['module']:<20} FAILED  {' '.join(entry['error'])}")
+            continue
+        heaviest = ', '.join(f"{item['package']} {item['seconds']:.3f}s" for item in entry['heaviest_imports'])
+        print(f"{entry['module']:<20} {entry['cumulative_seconds']:8.3f}s   {heaviest}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['module']}: {regression['baseline_seconds']:.3f}s -> "
+                  f"{regression['seconds']:.3f}s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# CPU inference backends of the exam models. Besides eager PyTorch, every `best.pt` can be exported
+# once to ONNX Runtime or OpenVINO; the exported model is cached next to the weights and loaded
+# through ultralytics, so predictions keep the same `Results` objects and response schema. Inference
+# profiles pick the backend and input size per request (`reference` or the faster `fast`).
+#
+# Key Features:
+"""
+Backends:
+- `torch`    : The `.pt` weights through PyTorch (default).
+- `onnx`     : `best.onnx` next to the weights, run with ONNX Runtime.
+- `openvino` : `best_openvino_model/` next to the weights, run with OpenVINO.
+- `onnx-int8`: `best.int8-qdq.onnx`, the ONNX export with post-training static INT8 quantisation (QDQ,
+               per-channel weights), calibrated on sample frames (see Calibration below).
+
+Profiles (`profile` request parameter, or per route):
+- `reference` : The configured backend at the model's own input size (default): the training size
+                stored in the `.pt` weights, else `AI_EXPORT_IMGSZ`.
+- `fast`      : `AI_FAST_BACKEND` (default `onnx-int8`) at `AI_FAST_IMGSZ` (default 480) for
+                high-throughput screening; `parityReport.py` measures its accuracy cost.
+
+Configuration (environment variables):
+- `AI_INFERENCE_BACKEND`  : Backend of every model (default `torch`).
+- `AI_INFERENCE_BACKENDS` : Per-model overrides, e.g. `Placenta_Position=onnx,Organ_Location=openvino`.
+- `AI_EXPORT_IMGSZ`       : Input size used for the export (default 640).
+- `AI_BACKEND_THREADS`    : Intra-op threads of every ONNX Runtime / OpenVINO model (default: the
+                            runtime's own, all cores). `serve.py` sets it to the worker's torch
+                            thread count, so exported models respect the same per-worker limit.
+- `AI_INFERENCE_PROFILE`  : Default profile (`reference`).
+- `AI_PROFILES`           : Per-route default profiles, e.g. `Placental-Detection=fast`.
+
+Calibration of `onnx-int8`:
+- Activation ranges come from `AI_CALIBRATION_FRAMES` frames (default 64) loaded with
+  `parityReport.load_frames`: the images in `AI_CALIBRATION_DIR` (default `frames/placental_frames`),
+  then the first `AI_CALIBRATION_SECONDS` (default 15) of the sample scan video sampled at
+  `AI_CALIBRATION_FPS` (default 4), letterboxed to `AI_FAST_IMGSZ`.
+- The parity report's default held-out frames are the rest of that video, so the measured accuracy
+  cost never includes calibration frames.
+- The non-convolution nodes of the detection head (box decoding and the output concat, where boxes
+  in pixels and class scores share a tensor) stay in float.
+
+Every prediction passes its input size explicitly: ultralytics keeps the arguments of the previous
+call on a model, and `fast` and `reference` may share one loaded model (e.g. `AI_FAST_BACKEND=torch`).
+
+Exports use dynamic input shapes so batched frames of any size work. An export is redone when the
+`.pt` file is newer than the cached artifact; concurrent workers wait for one another's export.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# Ultralytics YOLO       : Export and loading of all backends (imported on use).
+# ONNX Runtime           : Runtime of the `onnx` backend and static INT8 quantisation.
+# OpenCV (cv2)           : Letterboxing of the calibration frames (imported on use).
+# OpenVINO               : Runtime of the `openvino` backend (pinned, so ultralytics never installs
+#                          it at runtime; only imported when the backend is configured).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI MODELS)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines: exports are only guarded within the process
+    fcntl = None
+
+BACKENDS = ('torch', 'onnx', 'openvino', 'onnx-int8')
+PROFILES = ('reference', 'fast')
+# Name of the INT8 artifact and its cached results; changed whenever the quantisation changes
+INT8_VARIANT = 'int8-qdq'
+
+
+def parse_overrides(value):
+    """Parse `name=value,name=value` into a dict."""
+    overrides = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, _, value = item.partition('=')
+        overrides[name.strip()] = value.strip().lower()
+    return overrides
+
+
+class BackendConfig:
+    DEFAULT = os.getenv('AI_INFERENCE_BACKEND', 'torch').lower()
+    OVERRIDES = parse_overrides(os.getenv('AI_INFERENCE_BACKENDS', ''))
+    EXPORT_IMGSZ = int(os.getenv('AI_EXPORT_IMGSZ', '640'))
+    THREADS = int(os.getenv('AI_BACKEND_THREADS', '0'))
+
+
+class CalibrationConfig:
+    FRAMES = int(os.getenv('AI_CALIBRATION_FRAMES', '64'))
+    FPS = float(os.getenv('AI_CALIBRATION_FPS', '4'))
+    # Calibration only samples the sample video up to here; the parity report holds out the rest
+    SECONDS = float(os.getenv('AI_CALIBRATION_SECONDS', '15'))
+    FRAMES_DIR = os.getenv('AI_CALIBRATION_DIR')
+
+
+class ProfileConfig:
+    DEFAULT = os.getenv('AI_INFERENCE_PROFILE', 'reference').lower()
+    ROUTE_DEFAULTS = parse_overrides(os.getenv('AI_PROFILES', ''))
+    FAST_BACKEND = os.getenv('AI_FAST_BACKEND', 'onnx-int8').lower()
+    FAST_IMGSZ = int(os.getenv('AI_FAST_IMGSZ', '480'))
+
+
+def validate_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+
+def backend_for(model_name):
+    """Configured backend of a model (by model name, see examTasks.py)."""
+    return validate_backend(BackendConfig.OVERRIDES.get(model_name, BackendConfig.DEFAULT))
+
+
+def artifact_path(model_path, backend):
+    """Where the exported model of `backend` is cached for the weights at `model_path`."""
+    base, _ = os.path.splitext(model_path)
+    if backend == 'onnx':
+        return f'{base}.onnx'
+    if backend == 'onnx-int8':
+        return f'{base}.{INT8_VARIANT}.onnx'
+    if backend == 'openvino':
+        return f'{base}_openvino_model'
+    return model_path
+
+
+def is_fresh(artifact, model_path):
+    """Whether an exported artifact exists and is at least as new as its weights."""
+    return os.path.exists(artifact) and os.path.getmtime(artifact) >= os.path.getmtime(model_path)
+
+
+def artifact_bytes(path):
+    """Size on disk of a model file or exported model folder."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+_export_locks = {}
+_export_locks_guard = threading.Lock()
+
+
+@contextmanager
+def export_lock(artifact):
+    """Serialise exports of one artifact across threads and (where supported) worker processes."""
+    with _export_locks_guard:
+        thread_lock = _export_locks.setdefault(artifact, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f'{artifact}.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def prepare_model(model_path, backend):
+    """Return the path to load for `backend`, exporting the weights first if needed."""
+    validate_backend(backend)
+    artifact = artifact_path(model_path, backend)
+    if backend == 'torch' or is_fresh(artifact, model_path):
+        return artifact
+
+    if backend == 'onnx-int8':
+        # Quantised from the float ONNX export, which is prepared (and cached) first
+        source = prepare_model(model_path, 'onnx')
+        with export_lock(artifact):
+            if not is_fresh(artifact, source):
+                quantize_model(source, artifact)
+        return artifact
+
+    with export_lock(artifact):
+        # Another worker may have finished the export while we waited
+        if not is_fresh(artifact, model_path):
+            from ultralytics import YOLO
+
+            exported = YOLO(model_path).export(format=backend, dynamic=True, imgsz=BackendConfig.EXPORT_IMGSZ)
+            if os.path.abspath(exported) != os.path.abspath(artifact):
+                os.replace(exported, artifact)
+    return artifact
+
+
+def limit_threads(runtime, path, backend, threads):
+    """Rebuild the ONNX Runtime session / OpenVINO compiled model of an ultralytics AutoBackend with `threads`."""
+    if backend in ('onnx', 'onnx-int8'):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        runtime.session = onnxruntime.InferenceSession(path, options, providers=runtime.session.get_providers())
+    elif backend == 'openvino':
+        import openvino
+
+        core = openvino.Core()
+        network = core.read_model(str(next(Path(path).glob('*.xml'))))
+        runtime.ov_compiled_model = core.compile_model(
+            network, 'CPU', config={'PERFORMANCE_HINT': 'LATENCY', 'INFERENCE_NUM_THREADS': threads},
+        )
+
+
+def letterbox(image, imgsz):
+    """BGR frame -> 1x3ximgszximgsz float RGB tensor in [0, 1], resized and padded like ultralytics."""
+    import cv2
+
+    height, width = image.shape[:2]
+    scale = imgsz / max(height, width)
+    resized = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - resized.shape[0]) // 2, (imgsz - resized.shape[1]) // 2
+    canvas[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+    return np.ascontiguousarray(canvas[:, :, ::-1].transpose(2, 0, 1))[None].astype(np.float32) / 255.0
+
+
+def calibration_frames():
+    """Sample frames for the INT8 calibration, disjoint from the parity report's default held-out frames."""
+    from parityReport import load_frames, DEFAULT_FRAMES_DIR, DEFAULT_VIDEOS
+
+    frames = load_frames(CalibrationConfig.FRAMES_DIR or DEFAULT_FRAMES_DIR, DEFAULT_VIDEOS,
+                         CalibrationConfig.FPS, CalibrationConfig.FRAMES, end=CalibrationConfig.SECONDS)
+    if not frames:
+        raise RuntimeError("No calibration frames for the INT8 model (set AI_CALIBRATION_DIR)")
+    return frames
+
+
+def head_nodes(model_file):
+    """Non-convolution nodes of the last module (the detection head's decoding) of a YOLO ONNX graph."""
+    import onnx
+
+    nodes = onnx.load(model_file).graph.node
+    modules = [int(match.group(1)) for match in (re.match(r'/model\.(\d+)/', node.name) for node in nodes) if match]
+    if not modules:
+        return []
+    prefix = f'/model.{max(modules)}/'
+    return [node.name for node in nodes if node.name.startswith(prefix) and node.op_type != 'Conv']
+
+
+def quantize_model(source, artifact):
+    """Static INT8 (QDQ) quantisation of a float ONNX model, calibrated on sample frames."""
+    import onnxruntime
+    from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType,
+                                          quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # Shape inference and graph optimisation first, as ONNX Runtime recommends for static quantisation
+    prepared = f'{artifact}.prep.onnx'
+    quant_pre_process(source, prepared)
+    input_name = onnxruntime.InferenceSession(prepared, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    frames = calibration_frames()
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._inputs = ({input_name: letterbox(frame, ProfileConfig.FAST_IMGSZ)} for frame in frames)
+
+        def get_next(self):
+            return next(self._inputs, None)
+
+    try:
+        quantize_static(
+            prepared, f'{artifact}.tmp', FrameReader(),
+            quant_format=QuantFormat.QDQ, activation_type=QuantType.QInt8, weight_type=QuantType.QInt8,
+            per_channel=True, calibrate_method=CalibrationMethod.MinMax, nodes_to_exclude=head_nodes(prepared),
+        )
+        os.replace(f'{artifact}.tmp', artifact)
+    finally:
+        if os.path.exists(prepared):
+            os.remove(prepared)
+
+
+def load_backend_model(model_path, backend):
+    """Load the YOLO model of `model_path` on `backend` (exported and cached on first use)."""
+    from ultralytics import YOLO
+
+    path = prepare_model(model_path, backend)
+    if backend == 'torch':
+        return YOLO(path)
+
+    # Exported models do not carry the task in a form ultralytics can always infer
+    model = YOLO(path, task='detect')
+    if BackendConfig.THREADS > 0:
+        # ultralytics opens the runtime with default thread pools on the first prediction; reopen it limited
+        blank = np.zeros((BackendConfig.EXPORT_IMGSZ, BackendConfig.EXPORT_IMGSZ, 3), dtype=np.uint8)
+        model(blank, verbose=False)
+        limit_threads(model.predictor.model, path, backend, BackendConfig.THREADS)
+    return model
+
+
+def reference_imgsz(model=None):
+    """Input size of the `reference` profile: the training size kept by `.pt` models, else the export size."""
+    overrides = getattr(model, 'overrides', None) or {}
+    return overrides.get('imgsz') or BackendConfig.EXPORT_IMGSZ
+
+
+class InferenceProfile:
+    """Backend and input size used for the predictions of one request."""
+
+    def __init__(self, name, backend=None, imgsz=None):
+        self.name = name
+        self.backend = backend
+        self.imgsz = imgsz
+
+    def backend_for(self, model_name):
+        return self.backend or backend_for(model_name)
+
+    def predict_kwargs(self, model=None):
+        """Prediction arguments for `model`; `imgsz` is always given, so no earlier call's size lingers."""
+        return {'imgsz': self.imgsz or reference_imgsz(model)}
+
+    def cache_variant(self, model_name):
+        """Part of the result cache key: results differ between backends and input sizes."""
+        backend = self.backend_for(model_name)
+        if backend == 'onnx-int8':
+            backend = f'onnx-{INT8_VARIANT}'
+        return f'{backend}:{self.imgsz or ""}'
+
+
+def resolve_profile(task_name, requested=None):
+    """Profile of a request: the requested one, else the route default, else `AI_INFERENCE_PROFILE`."""
+    if requested is not None and not isinstance(requested, str):
+        raise ValueError("Profile must be a string")
+    name = (requested or ProfileConfig.ROUTE_DEFAULTS.get(task_name) or ProfileConfig.DEFAULT).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}', expected one of {PROFILES}")
+    if name == 'fast':
+        return InferenceProfile(name, validate_backend(ProfileConfig.FAST_BACKEND), ProfileConfig.FAST_IMGSZ)
+    return InferenceProfile(name)
@@ -0,0 +1,316 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Background analysis jobs. A whole video or frame set is submitted once and analysed by a worker
+# pool at full machine speed, independent of the browser tab. Results are stored as they are
+# produced, so clients can poll them or follow a stream and resume it from an offset.
+#
+# Key Features:
+"""
+Jobs:
+- `submit` stores the job in a local SQLite database (`AI_JOB_ROOT/jobs.sqlite3`) and puts it on a
+  bounded queue of `AI_JOB_QUEUE` jobs (default 16); a full queue raises `JobQueueFull`.
+- `AI_JOB_WORKERS` threads (default 1) run the jobs through the detection pipeline.
+- Every result is stored with its sequence number (0, 1, 2, ...); `iter_results` yields the
+  results from an offset and follows the job until it finishes, so a dropped stream can be resumed.
+- Status: `queued` -> `running` -> `done` / `failed`. Each job records the process that owns it;
+  when that process is gone, its running jobs are marked `failed` and its queued jobs are taken
+  over by the next process that starts its job queue.
+- Sources (video or frame files) live in `AI_JOB_ROOT/<job id>/` and are removed when the job ends;
+  finished jobs and their results are purged after `AI_JOB_RETENTION` seconds (default 86400).
+
+The database is shared by all gunicorn workers, so any worker can report status and results; a job
+runs in the worker that accepted it.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# sqlite3                : Local job and result store.
+# psutil                 : Checks whether the owner process of a job is still alive.
+# queue / threading      : Bounded job queue and worker pool.
+# Detection pipeline     : Frame analysis (`detectionPipeline.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, JOB PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import json
+import time
+import uuid
+import queue
+import shutil
+import sqlite3
+import threading
+import psutil
+from stageTimer import RequestTrace, traced
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class JobConfig:
+    ROOT = os.getenv('AI_JOB_ROOT', 'jobs')
+    WORKERS = int(os.getenv('AI_JOB_WORKERS', '1'))
+    QUEUE_SIZE = int(os.getenv('AI_JOB_QUEUE', '16'))
+    RETENTION_SECONDS = float(os.getenv('AI_JOB_RETENTION', '86400'))
+    POLL_SECONDS = 1.0
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue cannot take another job."""
+
+
+class JobStore:
+    """SQLite store of jobs and their results."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' id TEXT PRIMARY KEY, status TEXT NOT NULL, tasks TEXT NOT NULL, params TEXT NOT NULL,'
+                ' source TEXT NOT NULL, owner INTEGER NOT NULL, created_at REAL NOT NULL, started_at REAL,'
+                ' finished_at REAL, error TEXT, result_count INTEGER NOT NULL DEFAULT 0)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                ' job_id TEXT NOT NULL, seq INTEGER NOT NULL, payload TEXT NOT NULL,'
+                ' PRIMARY KEY (job_id, seq))'
+            )
+
+    def _execute(self, sql, args=()):
+        with self._lock, self._connection:
+            return self._connection.execute(sql, args).fetchall()
+
+    def _update(self, sql, args=()):
+        """Run an UPDATE and return the number of changed rows."""
+        with self._lock, self._connection:
+            return self._connection.execute(sql, args).rowcount
+
+    def create(self, job_id, tasks, params, source):
+        self._execute(
+            'INSERT INTO jobs (id, status, tasks, params, source, owner, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (job_id, 'queued', json.dumps(tasks), json.dumps(params), json.dumps(source), os.getpid(), time.time()),
+        )
+
+    def get(self, job_id):
+        rows = self._execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        for field in ('tasks', 'params', 'source'):
+            job[field] = json.loads(job[field])
+        return job
+
+    def claim(self, job_id):
+        """Mark a queued job as running in this process; False if it is no longer queued."""
+        return self._update("UPDATE jobs SET status = 'running', started_at = ?, owner = ? "
+                            "WHERE id = ? AND status = 'queued'", (time.time(), os.getpid(), job_id)) == 1
+
+    def adopt(self, job_id, previous_owner):
+        """Take over a job of a process that is gone; False if another process was faster."""
+        return self._update('UPDATE jobs SET owner = ? WHERE id = ? AND owner = ?',
+                            (os.getpid(), job_id, previous_owner)) == 1
+
+    def finish(self, job_id, status, error=None):
+        self._execute('UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?',
+                      (status, time.time(), error, job_id))
+
+    def add_result(self, job_id, seq, payload):
+        with self._lock, self._connection:
+            self._connection.execute('INSERT INTO results (job_id, seq, payload) VALUES (?, ?, ?)',
+                                     (job_id, seq, json.dumps(payload)))
+            self._connection.execute('UPDATE jobs SET result_count = ? WHERE id = ?', (seq + 1, job_id))
+
+    def results(self, job_id, offset=0, limit=500):
+        rows = self._execute('SELECT seq, payload FROM results WHERE job_id = ? AND seq >= ? ORDER BY seq LIMIT ?',
+                             (job_id, offset, limit))
+        return [(row['seq'], json.loads(row['payload'])) for row in rows]
+
+    def owned_with_status(self, status):
+        """`(job id, owner pid)` of the jobs in `status`, oldest first."""
+        return [(row['id'], row['owner']) for row in self._execute(
+            'SELECT id, owner FROM jobs WHERE status = ? ORDER BY created_at', (status,))]
+
+    def purge_finished(self, older_than):
+        """Delete finished jobs (and their results) that ended before `older_than`."""
+        with self._lock, self._connection:
+            expired = [row['id'] for row in self._connection.execute(
+                'SELECT id FROM jobs WHERE status IN (?, ?) AND finished_at < ?', (*FINISHED_STATUSES, older_than))]
+            for job_id in expired:
+                self._connection.execute('DELETE FROM results WHERE job_id = ?', (job_id,))
+                self._connection.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+        return expired
+
+
+def job_frames(source):
+    """Frame source of a job: decoded video frames or the stored frame files, in order."""
+    if source['type'] == 'video':
+        from videoIngestion import iter_video_frames
+
+        yield from iter_video_frames(source['path'], source.get('fps'))
+        return
+    for name in sorted(os.listdir(source['path'])):
+        with open(os.path.join(source['path'], name), 'rb') as frame_file:
+            yield frame_file.read()
+
+
+class JobQueue:
+    """Bounded queue of analysis jobs, run by a pool of worker threads."""
+
+    def __init__(self, root, workers, queue_size, retention_seconds):
+        self.root = root
+        self.workers = max(1, workers)
+        self.retention_seconds = retention_seconds
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._store = None
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._new_results = threading.Condition()
+
+    @property
+    def store(self):
+        self._ensure_started()
+        return self._store
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._store = JobStore(os.path.join(self.root, 'jobs.sqlite3'))
+            self._recover()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'job-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _recover(self):
+        # Jobs of live processes (other gunicorn workers) are left alone
+        for job_id, owner in self._store.owned_with_status('running'):
+            if not psutil.pid_exists(owner) and self._store.adopt(job_id, owner):
+                # Results of an interrupted job are incomplete
+                self._store.finish(job_id, 'failed', 'Interrupted by a service restart')
+                shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+        for job_id, owner in self._store.owned_with_status('queued'):
+            if psutil.pid_exists(owner) or not self._store.adopt(job_id, owner):
+                continue
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                self._store.finish(job_id, 'failed', 'Job queue was full after a service restart')
+
+    def job_dir(self, job_id):
+        return os.path.join(self.root, job_id)
+
+    def new_job_id(self):
+        return uuid.uuid4().hex
+
+    def submit(self, job_id, tasks, params, source):
+        """Store and queue a job. `source` is `{'type': 'video', 'path', 'fps'}` or `{'type': 'frames', 'path'}`."""
+        self._ensure_started()
+        self._store.purge_finished(time.time() - self.retention_seconds)
+        self._store.create(job_id, tasks, params, source)
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            self._store.finish(job_id, 'failed', 'Job queue is full')
+            shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+            raise JobQueueFull("Job queue is full, try again later")
+        return self._store.get(job_id)
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def _notify(self):
+        with self._new_results:
+            self._new_results.notify_all()
+
+    def _run(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._execute(job_id)
+            finally:
+                self._queue.task_done()
+                self._notify()
+
+    def _execute(self, job_id):
+        # Imported here so that importing the job queue does not load the pipeline
+        from detectionPipeline import run_task, run_tasks
+        from workspaces import workspaces
+
+        job = self._store.get(job_id)
+        if job is None or not self._store.claim(job_id):
+            return
+        params = job['params']
+        workspace = None
+        try:
+            workspace = workspaces.get_or_create(params.get('session_id'))
+            options = dict(batch_size=params.get('batch_size'), max_wait=params.get('max_wait'),
+                           response_mode=params.get('response_mode'), image_policy=params.get('image_policy'),
+                           workspace=workspace, profile=params.get('profile'), emit=params.get('emit'),
+                           mode=params.get('mode'))
+            frames = job_frames(job['source'])
+            if len(job['tasks']) == 1:
+                results = run_task(job['tasks'][0], frames, **options)
+            else:
+                results = run_tasks(job['tasks'], frames, **options)
+            # Stage timings of background jobs are reported under the `/jobs` route
+            for seq, result in enumerate(traced(results, RequestTrace(route='/jobs'))):
+                self._store.add_result(job_id, seq, result)
+                self._notify()
+            self._store.finish(job_id, 'done')
+        except Exception as e:
+            self._store.finish(job_id, 'failed', str(e))
+        finally:
+            shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+            if workspace is not None:
+                workspaces.release(workspace)
+
+    def iter_results(self, job_id, offset=0, follow=True):
+        """
+        Yield `(seq, result)` from `offset` on. With `follow`, wait for new results until the job
+        has finished; results written by other worker processes are picked up by polling.
+        """
+        store = self.store
+        while True:
+            job = store.get(job_id)
+            if job is None:
+                return
+            batch = store.results(job_id, offset)
+            for seq, result in batch:
+                yield seq, result
+                offset = seq + 1
+            if batch:
+                continue
+            if job['status'] in FINISHED_STATUSES or not follow:
+                # Results stored between the status read and the query are still delivered
+                if job['result_count'] <= offset:
+                    return
+                continue
+            with self._new_results:
+                self._new_results.wait(JobConfig.POLL_SECONDS)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+        }
+
+
+# Shared job queue of this process
+job_queue = JobQueue(JobConfig.ROOT, JobConfig.WORKERS, JobConfig.QUEUE_SIZE, JobConfig.RETENTION_SECONDS)
@@ -0,0 +1,241 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Service metrics of the AI backend in the Prometheus text format, served on `/metrics`. Counters,
+# gauges and histograms are kept in process (no extra dependency); with several gunicorn workers
+# every worker reports its own values.
+#
+# Key Features:
+"""
+Metrics:
+- `ai_stage_seconds{stage, model, route}`   : Histogram of each pipeline stage (decode, dedup,
+                                              cache_lookup, inference, annotate, analyse, encode);
+                                              background jobs use the route `/jobs`.
+- `ai_request_seconds{route}`               : Histogram of whole streamed requests.
+- `ai_frame_latency_seconds{route}`         : Histogram of each frame's latency, from the pipeline
+                                              taking the frame to its streamed result.
+- `ai_frames_total{route, task, outcome}`   : Frames streamed (`analysed`, `duplicate`, `rejected`,
+                                              `error`).
+- `ai_inflight_requests{route}`             : Gauge of requests currently streaming.
+- Collectors registered by `app.py` add cache, storage and model-registry values at scrape time.
+
+Stage timings come from `stageTimer.py`, which forwards every timed stage to this module; the
+route and the frame intake times come from the request trace `track_stream` binds.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# bisect / threading     : Histogram buckets and thread-safe updates.
+# Stage timer            : Per-stage timings of the pipeline (`stageTimer.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, INSTRUMENTATION)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import time
+import bisect
+import threading
+from stageTimer import stage_timer, RequestTrace, traced
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsConfig:
+    ENABLED = os.getenv('AI_METRICS', '1').lower() in ('1', 'true', 'yes')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple((name, labels.get(name, '')) for name in self.labelnames)
+
+    def header(self):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [f'{self.name}{_format_labels(key)} {_format_value(value)}'
+                                for key, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    type_name = 'gauge'
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        lines = self.header()
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(key + (("le", _format_value(bound)),))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {count}')
+        return lines
+
+
+class CollectedMetric:
+    """Metric whose samples are read at scrape time from `collect()` -> [(labels dict, value)]."""
+
+    def __init__(self, name, documentation, type_name, collect):
+        self.name = name
+        self.documentation = documentation
+        self.type_name = type_name
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        for labels, value in self.collect():
+            lines.append(f'{self.name}{_format_labels(sorted(labels.items()))} {_format_value(value)}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, name, documentation, type_name='gauge'):
+        """Decorator registering a function as a scrape-time collector."""
+        def decorator(collect):
+            self.register(CollectedMetric(name, documentation, type_name, collect))
+            return collect
+        return decorator
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # One failing collector must not break the whole scrape
+                continue
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry(MetricsConfig.ENABLED)
+
+STAGE_SECONDS = metrics.register(Histogram(
+    'ai_stage_seconds', 'Time spent in each pipeline stage.', ('stage', 'model', 'route')))
+REQUEST_SECONDS = metrics.register(Histogram(
+    'ai_request_seconds', 'Duration of streamed analysis requests.', ('route',)))
+FRAME_LATENCY_SECONDS = metrics.register(Histogram(
+    'ai_frame_latency_seconds', 'Time from the pipeline taking a frame to its streamed result.', ('route',)))
+FRAMES = metrics.register(Counter(
+    'ai_frames_total', 'Frames streamed back to clients.', ('route', 'task', 'outcome')))
+INFLIGHT_REQUESTS = metrics.register(Gauge(
+    'ai_inflight_requests', 'Analysis requests currently streaming.', ('route',)))
+
+
+def _observe_stage(name, seconds, labels):
+    STAGE_SECONDS.observe(seconds, stage=name, model=labels.get('model', ''), route=labels.get('route', ''))
+
+
+if metrics.enabled:
+    stage_timer.add_observer(_observe_stage)
+
+
+def frame_outcome(frame_result):
+    if 'error' in frame_result:
+        return 'error'
+    if frame_result.get('skipped'):
+        return 'duplicate'
+    if frame_result.get('rejected'):
+        return 'rejected'
+    return 'analysed'
+
+
+def track_stream(route, results, task_name=''):
+    """Pass `results` through while recording in-flight, duration, latency and frame metrics."""
+    if not metrics.enabled:
+        yield from results
+        return
+
+    trace = RequestTrace(route=route)
+    INFLIGHT_REQUESTS.inc(route=route)
+    start = time.perf_counter()
+    try:
+        for frame_result in traced(results, trace):
+            taken = trace.taken.get(frame_result.get('frame_number'))
+            if taken is not None:
+                FRAME_LATENCY_SECONDS.observe(time.perf_counter() - taken, route=route)
+            FRAMES.inc(route=route, task=frame_result.get('task', task_name), outcome=frame_outcome(frame_result))
+            yield frame_result
+    finally:
+        INFLIGHT_REQUESTS.dec(route=route)
+        REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
@@ -0,0 +1,178 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module keeps one warm instance of every YOLO model used by the AI backend. The detection
+# modules ask the registry for their model instead of rebuilding it from the `.pt` weights on
+# every request.
+#
+# Key Features:
+"""
+Model Registry:
+- Loads each of the six exam models once per process and keeps it in memory.
+- Supports lazy loading (on first request), eager loading (at startup) or background loading
+  (the service starts serving at once while the models load in a background thread).
+- Imports ultralytics/torch only when the first model is loaded.
+- Runs a warm-up prediction after loading so the first real frame is not slowed down.
+- Records per-model load time and memory usage for the `/models` endpoint.
+- Serialises predictions on each shared model, since threads of one worker share it.
+- Loads each model on its configured CPU backend (`torch`, `onnx` or `openvino`, see
+  `inferenceBackends.py`); models are keyed by weights path and backend.
+
+Configuration (environment variables):
+- `AI_MODEL_LOADING` : `lazy` (default), `eager` or `background` (fast startup).
+- `AI_MODEL_WARMUP`  : `1` (default) to run a warm-up prediction after loading, `0` to skip it.
+- `AI_INFERENCE_BACKEND` / `AI_INFERENCE_BACKENDS` : Backend of all models / per model.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# Ultralytics YOLO       : AI models for ultrasound analysis (imported on first model load).
+# NumPy                  : Blank frame used for the warm-up prediction.
+# psutil                 : Process memory measurement around model loading.
+# threading              : Guards concurrent first-time loads of the same model.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI MODELS)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import time
+import threading
+import numpy as np
+import psutil
+from examTasks import TASKS
+from inferenceBackends import backend_for, load_backend_model, artifact_path, artifact_bytes
+
+
+# Weights of the six exam models, keyed by model name (see examTasks.py)
+MODEL_PATHS = {task.model: task.model_path for task in TASKS.values()}
+
+
+class RegistryConfig:
+    LOADING_MODE = os.getenv('AI_MODEL_LOADING', 'lazy').lower()
+    WARMUP = os.getenv('AI_MODEL_WARMUP', '1') == '1'
+    WARMUP_SIZE = 640
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded YOLO models, keyed by weights path and backend."""
+
+    def __init__(self, model_paths):
+        self.model_paths = dict(model_paths)
+        self._models = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._inference_locks = {}
+
+    def _name_for(self, model_path):
+        for name, path in self.model_paths.items():
+            if path == model_path:
+                return name
+        return model_path
+
+    def _key(self, model_path, backend):
+        return model_path, backend or backend_for(self._name_for(model_path))
+
+    def _load(self, model_path, backend):
+        process = psutil.Process(os.getpid())
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+
+        # ultralytics/torch are imported here, on first load, so starting the service stays fast
+        model = load_backend_model(model_path, backend)
+        load_seconds = time.perf_counter() - start
+
+        warmup_seconds = 0.0
+        if RegistryConfig.WARMUP:
+            blank = np.zeros((RegistryConfig.WARMUP_SIZE, RegistryConfig.WARMUP_SIZE, 3), dtype=np.uint8)
+            start = time.perf_counter()
+            model(blank, verbose=False)
+            warmup_seconds = time.perf_counter() - start
+
+        if backend == 'torch':
+            parameter_bytes = sum(p.numel() * p.element_size() for p in model.model.parameters())
+        else:
+            # Exported models hold their weights in the runtime; report the artifact size instead
+            parameter_bytes = artifact_bytes(artifact_path(model_path, backend))
+        self._stats[(model_path, backend)] = {
+            'name': self._name_for(model_path),
+            'path': model_path,
+            'backend': backend,
+            'artifact': artifact_path(model_path, backend),
+            'load_seconds': round(load_seconds, 4),
+            'warmup_seconds': round(warmup_seconds, 4),
+            'parameter_bytes': int(parameter_bytes),
+            'rss_delta_bytes': int(process.memory_info().rss - rss_before),
+            'loaded_at': time.time(),
+        }
+        return model
+
+    def get(self, model_path, backend=None):
+        """Return the warm model for `model_path` on `backend` (default: configured), loading it on first use."""
+        key = self._key(model_path, backend)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        # Only one thread builds a given model; others wait and reuse it
+        with path_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(*key)
+                self._models[key] = model
+        return model
+
+    def inference_lock(self, model_path, backend=None):
+        """Lock serialising predictions on one shared model (YOLO predictors are not thread-safe)."""
+        key = self._key(model_path, backend)
+        with self._lock:
+            return self._inference_locks.setdefault(key, threading.Lock())
+
+    def load_all(self):
+        """Eagerly load every known model (used when `AI_MODEL_LOADING=eager`)."""
+        for model_path in self.model_paths.values():
+            self.get(model_path)
+
+    def report(self):
+        """Per-model load status, load time and memory usage."""
+        report = []
+        for name, model_path in self.model_paths.items():
+            key = self._key(model_path, None)
+            entry = {'name': name, 'path': model_path, 'backend': key[1], 'loaded': key in self._models}
+            entry.update(self._stats.get(key, {}))
+            report.append(entry)
+        return {
+            'loading_mode': RegistryConfig.LOADING_MODE,
+            'process_rss_bytes': psutil.Process(os.getpid()).memory_info().rss,
+            'models': report,
+        }
+
+
+# Shared registry used by all detection modules
+registry = ModelRegistry(MODEL_PATHS)
+
+
+def get_model(model_path, backend=None):
+    return registry.get(model_path, backend)
+
+
+def inference_lock(model_path, backend=None):
+    return registry.inference_lock(model_path, backend)
+
+
+def preload_models():
+    """Load all models now (eager) or in a background thread (background), as configured."""
+    if RegistryConfig.LOADING_MODE == 'eager':
+        registry.load_all()
+    elif RegistryConfig.LOADING_MODE == 'background':
+        threading.Thread(target=registry.load_all, name='model-preload', daemon=True).start()
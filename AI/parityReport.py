@@ -0,0 +1,200 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Accuracy-parity report of the `fast` inference profile against the `reference` profile. Both
+# profiles run over the same held-out frames and their detections are matched box by box, so the
+# accuracy cost of the fast profile is measured instead of guessed.
+#
+# Usage:
+"""
+    python parityReport.py                                   # every exam, default held-out frames
+    python parityReport.py --tasks Organ-Assessment --frames-dir heldout/
+    python parityReport.py --videos other_scan.mp4 --fps 2 --json parity.json
+
+Held-out frames must not be calibration frames of the INT8 model (`inferenceBackends.py`). By
+default they are the sample scan video after the calibration range (`AI_CALIBRATION_SECONDS`);
+`--frames-dir` and `--videos` replace that default with the given sources only.
+
+Per exam the report lists:
+- `mean_iou`        : Mean IoU of reference boxes matched to a fast box (greedy, best IoU first).
+- `class_agreement` : Share of matched boxes with the same class.
+- `recall`          : Share of reference boxes matched at `--iou` (default 0.5).
+- `precision`       : Share of fast boxes matched at `--iou`.
+- `frame_agreement` : Share of frames where both profiles agree on "any detection".
+- `speedup`         : Reference inference time divided by fast inference time.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# NumPy                  : IoU matrices (`frameTracking.box_iou`).
+# OpenCV (cv2)           : Reading held-out frames.
+# Model registry         : Reference and fast models (`modelRegistry.py`, `inferenceBackends.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, TOOLING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import sys
+import json
+import time
+import glob
+import argparse
+import numpy as np
+from frameTracking import box_iou
+
+AI_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(AI_DIR)
+
+# Default frame sources; the INT8 calibration uses the images and the start of the video
+DEFAULT_FRAMES_DIR = os.path.join(AI_DIR, 'frames', 'placental_frames')
+DEFAULT_VIDEOS = [os.path.join(REPO_DIR, '08.01.2025_12.01.17_REC.mp4')]
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def load_frames(frames_dir, videos, sample_fps, max_frames, start=0.0, end=None):
+    """Every image in `frames_dir`, then frames sampled from `videos` between `start` and `end` seconds."""
+    import cv2
+    from videoIngestion import iter_video_frames
+
+    frames = []
+    if frames_dir and os.path.isdir(frames_dir):
+        for path in sorted(glob.glob(os.path.join(frames_dir, '*'))):
+            if path.lower().endswith(IMAGE_EXTENSIONS):
+                image = cv2.imread(path)
+                if image is not None:
+                    frames.append(image)
+    for path in videos:
+        if not os.path.isfile(path):
+            continue
+        for frame in iter_video_frames(path, sample_fps, start, end):
+            if len(frames) >= max_frames:
+                break
+            frames.append(frame)
+    return frames[:max_frames]
+
+
+def match_boxes(reference, fast):
+    """Greedy one-to-one matching by IoU: [(reference index, fast index, iou)], best IoU first."""
+    iou = box_iou(reference['boxes'], fast['boxes'])
+    pairs = []
+    used_reference, used_fast = set(), set()
+    for index in np.argsort(-iou, axis=None):
+        ref_index, fast_index = np.unravel_index(index, iou.shape)
+        if iou[ref_index, fast_index] <= 0:
+            break
+        if ref_index in used_reference or fast_index in used_fast:
+            continue
+        used_reference.add(ref_index)
+        used_fast.add(fast_index)
+        pairs.append((ref_index, fast_index, float(iou[ref_index, fast_index])))
+    return pairs
+
+
+def detections(result):
+    boxes = result.boxes
+    return {'boxes': boxes.xyxy.cpu().numpy(), 'classes': boxes.cls.int().tolist()}
+
+
+def run_profile(task, profile, frames, batch_size):
+    """Detections of every frame with `profile`, and the total inference time."""
+    from modelRegistry import registry
+
+    backend = profile.backend_for(task.model)
+    model = registry.get(task.model_path, backend)
+    outputs = []
+    seconds = 0.0
+    for start in range(0, len(frames), batch_size):
+        batch = frames[start:start + batch_size]
+        begin = time.perf_counter()
+        results = list(model(batch, verbose=False, **profile.predict_kwargs(model)))
+        seconds += time.perf_counter() - begin
+        outputs.extend(detections(result) for result in results)
+    return outputs, seconds
+
+
+def compare_task(task, frames, iou_threshold, batch_size):
+    from inferenceBackends import resolve_profile
+
+    reference, reference_seconds = run_profile(task, resolve_profile(task.name, 'reference'), frames, batch_size)
+    fast, fast_seconds = run_profile(task, resolve_profile(task.name, 'fast'), frames, batch_size)
+
+    ious, same_class = [], 0
+    reference_boxes = fast_boxes = matched = frames_agreeing = 0
+    for ref, candidate in zip(reference, fast):
+        reference_boxes += len(ref['classes'])
+        fast_boxes += len(candidate['classes'])
+        frames_agreeing += bool(ref['classes']) == bool(candidate['classes'])
+        for ref_index, fast_index, iou in match_boxes(ref, candidate):
+            ious.append(iou)
+            same_class += ref['classes'][ref_index] == candidate['classes'][fast_index]
+            matched += iou >= iou_threshold
+
+    return {
+        'task': task.name,
+        'frames': len(frames),
+        'reference_boxes': reference_boxes,
+        'fast_boxes': fast_boxes,
+        'mean_iou': round(float(np.mean(ious)), 4) if ious else None,
+        'class_agreement': round(same_class / len(ious), 4) if ious else None,
+        'recall': round(matched / reference_boxes, 4) if reference_boxes else None,
+        'precision': round(matched / fast_boxes, 4) if fast_boxes else None,
+        'frame_agreement': round(frames_agreeing / len(frames), 4) if frames else None,
+        'reference_seconds': round(reference_seconds, 4),
+        'fast_seconds': round(fast_seconds, 4),
+        'speedup': round(reference_seconds / fast_seconds, 2) if fast_seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy parity of the fast inference profile")
+    parser.add_argument('--tasks', nargs='*', default=None, help="exam routes (default: all)")
+    parser.add_argument('--frames-dir', help="folder of held-out frames")
+    parser.add_argument('--videos', nargs='*', help="videos to sample held-out frames from")
+    parser.add_argument('--fps', type=float, default=2, help="sampling rate of the videos")
+    parser.add_argument('--max-frames', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--iou', type=float, default=0.5, help="IoU at which a box counts as matched")
+    parser.add_argument('--json', dest='json_path', help="write the report to this file")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    frames_dir = os.path.abspath(args.frames_dir) if args.frames_dir else None
+    videos = [os.path.abspath(path) for path in args.videos or []]
+    sys.path.insert(0, AI_DIR)
+    os.chdir(AI_DIR)
+
+    from examTasks import TASKS, get_task
+    from inferenceBackends import CalibrationConfig
+
+    # Without explicit sources: the sample video after the frames the INT8 model was calibrated on
+    start = 0.0
+    if frames_dir is None and args.videos is None:
+        videos, start = DEFAULT_VIDEOS, CalibrationConfig.SECONDS
+
+    tasks = [get_task(name) for name in (args.tasks or TASKS)]
+    frames = load_frames(frames_dir, videos, args.fps, args.max_frames, start=start)
+    if not frames:
+        parser.error("No held-out frames found")
+
+    report = {'iou_threshold': args.iou, 'tasks': []}
+    for task in tasks:
+        entry = compare_task(task, frames, args.iou, args.batch_size)
+        report['tasks'].append(entry)
+        print(f"{task.name:<26} frames {entry['frames']:4d}  mean IoU {entry['mean_iou']}  "
+              f"class agreement {entry['class_agreement']}  recall {entry['recall']}  "
+              f"precision {entry['precision']}  speedup {entry['speedup']}x")
+
+    if json_path:
+        with open(json_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Request options shared by every way of starting an analysis: the exam routes, `/analyze-video`,
+# `/jobs` and the `/scan` Socket.IO namespace. Options are parsed and validated once, up front, so
+# a bad value is answered with a 400 (or an error event) before any frame is processed.
+#
+# Key Features:
+"""
+Options (JSON body, form fields or query string, see `binaryTransport.py`):
+- `response_mode` / `images` : Response format and which frames carry an image (`resultEncoding.py`).
+- `profile`                  : Inference profile, validated for every requested exam (`inferenceBackends.py`).
+- `emit`                     : `all` or `filtered` frames (`frameSelection.py`).
+- `mode`                     : `detect` every frame or `track` between keyframes (`frameTracking.py`).
+- `batch_size` / `max_wait`  : Batching overrides (`frameBatching.py`).
+- `fps`                      : Sampling rate of server-side video decoding (`videoIngestion.py`).
+- `session_id`               : Session workspace to continue (`workspaces.py`); routes may fall back
+                               to the `X-Session-Id` header.
+
+`parse_options` raises ValueError for any invalid option; `RequestOptions.pipeline_kwargs()` are the
+keyword arguments of `detectionPipeline.run_task` / `run_tasks`.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# None beyond the validators of the modules above (no model or image libraries are used here).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, FLASK)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+from resultEncoding import resolve_options
+from inferenceBackends import resolve_profile
+from frameSelection import resolve_emit
+from frameTracking import resolve_mode
+from frameBatching import resolve_batching
+from videoIngestion import resolve_fps
+from workspaces import SESSION_ID_PATTERN
+
+
+class RequestOptions:
+    """Validated options of one analysis request."""
+
+    def __init__(self, response_mode, image_policy, profile, emit, mode, batch_size, max_wait, fps, session_id):
+        self.response_mode = response_mode
+        self.image_policy = image_policy
+        self.profile = profile
+        self.emit = emit
+        self.mode = mode
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.fps = fps
+        self.session_id = session_id
+
+    @property
+    def compact(self):
+        return self.response_mode == 'compact'
+
+    def pipeline_kwargs(self, **overrides):
+        """Keyword arguments of `run_task` / `run_tasks` (and of a stored job)."""
+        return {
+            'batch_size': self.batch_size,
+            'max_wait': self.max_wait,
+            'response_mode': self.response_mode,
+            'image_policy': self.image_policy,
+            'profile': self.profile,
+            'emit': self.emit,
+            'mode': self.mode,
+            **overrides,
+        }
+
+
+def parse_options(params, task_names, session_id=None):
+    """Validate the options of a request that runs `task_names`; `session_id` is the fallback session."""
+    if not isinstance(params, dict):
+        raise ValueError("Expected a JSON object")
+
+    # `full` (default) or `compact` results, and which frames carry annotated images
+    response_mode, image_policy = resolve_options(params.get('response_mode'), params.get('images'))
+    # `reference` (default) or `fast` inference profile, which every requested exam must support
+    profile = params.get('profile') or None
+    for task_name in task_names:
+        resolve_profile(task_name, profile)
+    batch_size, max_wait = resolve_batching(params.get('batch_size'), params.get('max_wait'))
+
+    session_id = params.get('session_id') or session_id or None
+    if session_id is not None and not (isinstance(session_id, str) and SESSION_ID_PATTERN.match(session_id)):
+        raise ValueError("Invalid session id")
+
+    return RequestOptions(
+        response_mode, image_policy, profile,
+        emit=resolve_emit(params.get('emit')),
+        mode=resolve_mode(params.get('mode')),
+        batch_size=batch_size,
+        max_wait=max_wait,
+        fps=resolve_fps(params.get('fps')),
+        session_id=session_id,
+    )
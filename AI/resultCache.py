@@ -0,0 +1,283 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Content-addressed cache of inference results. Users often analyse the same video again (the
+# uploads folder holds many byte-identical re-uploads); frames seen before are answered from the
+# cache instead of running YOLO again.
+#
+# Key Features:
+"""
+Cache Key:
+- Hash of the decoded frame pixels (shape and bytes) plus a checksum of the model weights, so
+  replacing `best.pt` never serves stale detections.
+
+Cache Entries:
+- The raw detections (`boxes.data`, class names) of the frame, and the annotated image once it
+  has been encoded for a response.
+- Kept in memory with LRU eviction, bounded by `AI_RESULT_CACHE_MB` (default 256, 0 disables).
+- Optionally persisted to `AI_RESULT_CACHE_DIR` (one `.npz` per entry), so a restart keeps the
+  cache; entries found on disk are promoted back into memory.
+- The disk store is bounded by `AI_RESULT_CACHE_DISK_MB` (default 1024, 0 disables it): once it is
+  over the limit, the least recently used files (by mtime, refreshed on every disk hit) are deleted
+  down to 90% of it. Workers sharing the folder all enforce the same limit.
+
+Hit/miss counters are exposed through `stats()` and the `/result-cache` endpoint.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# hashlib                : Frame and weights hashing.
+# NumPy                  : Detection arrays and the on-disk format.
+# Ultralytics            : Rebuilds `Results` objects from cached detections (imported on use).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, CACHING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class CacheConfig:
+    MAX_BYTES = int(float(os.getenv('AI_RESULT_CACHE_MB', '256')) * 1024 * 1024)
+    DISK_DIR = os.getenv('AI_RESULT_CACHE_DIR', '')
+    DISK_MAX_BYTES = int(float(os.getenv('AI_RESULT_CACHE_DISK_MB', '1024')) * 1024 * 1024)
+
+
+_checksums = {}
+_checksums_lock = threading.Lock()
+
+
+def model_checksum(model_path):
+    """SHA-256 of a weights file, recomputed only when the file changes."""
+    stat = os.stat(model_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _checksums_lock:
+        cached = _checksums.get(model_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as weights:
+        for chunk in iter(lambda: weights.read(1024 * 1024), b''):
+            digest.update(chunk)
+    checksum = digest.hexdigest()
+    with _checksums_lock:
+        _checksums[model_path] = (signature, checksum)
+    return checksum
+
+
+def frame_key(image, model_path, variant=''):
+    """Cache key of a decoded frame for one model (and inference `variant`, if any)."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(model_checksum(model_path).encode())
+    digest.update(variant.encode())
+    digest.update(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+class CacheEntry:
+    """Detections of one frame for one model, plus its annotated image once encoded."""
+
+    def __init__(self, boxes, names, annotated_image=None):
+        self.boxes = boxes
+        self.names = names
+        self.annotated_image = annotated_image
+
+    @classmethod
+    def from_result(cls, result):
+        return cls(result.boxes.data.cpu().numpy().astype(np.float32), dict(result.names))
+
+    @property
+    def nbytes(self):
+        return self.boxes.nbytes + len(self.annotated_image or '') + 256
+
+    def to_result(self, image):
+        """Rebuild an ultralytics `Results` for `image` from the cached detections."""
+        import torch
+        from ultralytics.engine.results import Results
+
+        # Tensor boxes, like fresh predictions: `boxes.cls.int()` and `.cpu()` must keep working
+        return Results(orig_img=image, path='', names=self.names, boxes=torch.from_numpy(self.boxes))
+
+
+class ResultCache:
+    """LRU cache of inference results, bounded by memory and optionally backed by disk."""
+
+    def __init__(self, max_bytes, disk_dir='', disk_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = disk_dir if disk_max_bytes > 0 else ''
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = None  # unknown until the first write scans the folder
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f'{key}.npz')
+
+    def _store(self, key, entry):
+        # Caller holds the lock
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self._stats['evictions'] += 1
+
+    def _load_from_disk(self, key):
+        path = self._disk_path(key)
+        if not self.disk_dir or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                names = {int(k): v for k, v in json.loads(str(data['names'])).items()}
+                annotated_image = str(data['annotated_image']) or None
+                entry = CacheEntry(data['boxes'], names, annotated_image)
+        except Exception:
+            # A corrupt or partially written file is treated as a miss
+            return None
+        try:
+            # Recently used files are the last to be evicted
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _disk_files(self):
+        """[(mtime, size, path)] of every file in the disk store."""
+        files = []
+        for folder, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith('.npz'):
+                    path = os.path.join(folder, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _trim_disk(self):
+        # Caller holds the disk lock; the folder is rescanned, as other workers write to it too
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        if total > self.disk_max_bytes:
+            target = int(self.disk_max_bytes * 0.9)
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self._stats['disk_evictions'] += 1
+        self._disk_bytes = total
+
+    def _save_to_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as cache_file:
+                np.savez(cache_file, boxes=entry.boxes, names=json.dumps(entry.names),
+                         annotated_image=entry.annotated_image or '')
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            # The disk store is best effort; the in-memory entry is still valid
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._trim_disk()
+            else:
+                self._disk_bytes += size
+                if self._disk_bytes > self.disk_max_bytes:
+                    self._trim_disk()
+
+    def get(self, key):
+        """Return the cached entry for `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry
+
+        entry = self._load_from_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats['misses'] += 1
+            else:
+                self._stats['disk_hits'] += 1
+                self._store(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._store(key, entry)
+        self._save_to_disk(key, entry)
+
+    def image(self, key):
+        """Cached annotated image of `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.annotated_image if entry is not None else None
+
+    def attach_image(self, key, annotated_image):
+        """Store the annotated image encoded for a response alongside the detections."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.annotated_image is not None:
+                return
+            self._bytes -= entry.nbytes
+            entry.annotated_image = annotated_image
+            self._bytes += entry.nbytes
+        self._save_to_disk(key, entry)
+
+    def clear(self):
+        """Drop every in-memory entry (the disk store is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'disk_dir': self.disk_dir or None,
+                'disk_bytes': self._disk_bytes,
+                'disk_max_bytes': self.disk_max_bytes if self.disk_dir else None,
+            })
+        return stats
+
+
+# Shared cache used by the detection pipeline
+result_cache = ResultCache(CacheConfig.MAX_BYTES, CacheConfig.DISK_DIR, CacheConfig.DISK_MAX_BYTES)
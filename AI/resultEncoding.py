@@ -0,0 +1,96 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module controls how much data is sent back for each analysed frame. By default every
+# result carries the full annotated frame as a base64 JPEG; the compact mode sends only the
+# detections and attaches annotated images only where they are useful.
+#
+# Key Features:
+"""
+Response Modes (`response_mode`, default `AI_RESPONSE_MODE` = `full`):
+- `full`    : Original result format (`class_name`, `confidence`, `boxes`, `annotated_image`, ...).
+- `compact` : Per-detection `class_ids`, `class_names`, `boxes` (rounded to 0.1 px) and
+              `confidences`, serialised without JSON whitespace.
+
+Image Policies (`images`):
+- `all`        : Every frame carries its annotated image (default for `full`).
+- `detections` : Only frames with at least one detection carry an image (default for `compact`).
+- `none`       : No annotated images at all.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : JPEG encoding of annotated frames.
+# Base64                 : Encodes JPEG bytes for JSON transport.
+# JSON                   : Server-sent event payloads.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI RESULTS)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import json
+import base64
+import cv2
+
+RESPONSE_MODES = ('full', 'compact')
+IMAGE_POLICIES = ('all', 'detections', 'none')
+
+
+class ResponseConfig:
+    DEFAULT_MODE = os.getenv('AI_RESPONSE_MODE', 'full')
+    BOX_DECIMALS = 1
+    CONFIDENCE_DECIMALS = 4
+
+
+def resolve_options(response_mode=None, image_policy=None):
+    """Validate the requested response mode and image policy, filling in the defaults."""
+    response_mode = response_mode or ResponseConfig.DEFAULT_MODE
+    if response_mode not in RESPONSE_MODES:
+        raise ValueError(f"Unknown response_mode '{response_mode}', expected one of {RESPONSE_MODES}")
+
+    image_policy = image_policy or ('all' if response_mode == 'full' else 'detections')
+    if image_policy not in IMAGE_POLICIES:
+        raise ValueError(f"Unknown images policy '{image_policy}', expected one of {IMAGE_POLICIES}")
+    return response_mode, image_policy
+
+
+def wants_image(image_policy, has_detections):
+    return image_policy == 'all' or (image_policy == 'detections' and has_detections)
+
+
+def encode_image(frame):
+    """Encode an annotated frame as a base64 JPEG string."""
+    _, buffer = cv2.imencode('.jpg', frame)
+    return base64.b64encode(buffer).decode('utf-8')
+
+
+def compact_result(result, frame_number, num_placental):
+    """Build the compact per-frame payload straight from an ultralytics result."""
+    boxes = result.boxes
+    class_ids = boxes.cls.int().tolist()
+    return {
+        'frame_number': frame_number,
+        'num_placental': num_placental,
+        'class_ids': class_ids,
+        'class_names': [result.names[class_id] for class_id in class_ids],
+        'boxes': [
+            [round(value, ResponseConfig.BOX_DECIMALS) for value in box]
+            for box in boxes.xyxy.tolist()
+        ],
+        'confidences': [round(value, ResponseConfig.CONFIDENCE_DECIMALS) for value in boxes.conf.tolist()],
+    }
+
+
+def sse_event(payload, compact=False, event_id=None):
+    """Serialise a payload as one server-sent event (with an `id:` line for resumable streams)."""
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    if compact:
+        return f"{prefix}data: {json.dumps(payload, separators=(',', ':'))}\n\n"
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
@@ -0,0 +1,127 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Session-oriented streaming of a scan over one WebSocket (Socket.IO) connection. The client opens
+# a scan once and then pushes frames continuously; the server keeps the scan statistics (frame
+# index, detection counter, best frames) for the whole scan instead of seeing one-frame requests.
+#
+# Socket.IO namespace `/scan`:
+"""
+Client -> server events:
+- `start_scan` : `{"task": "<exam route>", "session_id"?, "response_mode"?, "images"?, "profile"?, "emit"?,
+                 "mode"?}`
+                 Starts (or resumes, with `session_id`) a scan. Replies with `scan_started`
+                 `{"session_id", "task", "frames_seen", "num_placental"}`.
+- `frame`      : One frame, either raw JPEG/PNG bytes (binary attachment) or a data-URL string.
+                 Replies with one `result` event in the same envelope as the SSE routes:
+                 `{"success": true, "result": {...}}`.
+- `end_scan`   : Replies with `scan_summary` `{"session_id", "task", "frames_seen",
+                 "num_placental", "best_frames"}`.
+
+Events of one connection are handled in order. Sessions are the workspaces from `workspaces.py`,
+so the same `session_id` can also be sent to the HTTP exam routes, and an interrupted connection
+can resume its scan until the workspace expires.
+
+Deployment: Flask-SocketIO supports gunicorn with a single worker only. Engine.IO starts with
+long-polling, and a handshake and its later polls handled by different workers fail with "Invalid
+session". `serve.py` therefore runs one worker while the namespace is on; `AI_SOCKETIO=0` turns it
+off (HTTP routes only) for deployments that need several workers.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# Flask-SocketIO         : WebSocket transport and event handling.
+# Detection pipeline     : Per-frame analysis and scan state (`detectionPipeline.py`).
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, FLASK, WEBSOCKETS)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+from flask import request
+from flask_socketio import SocketIO, emit
+from examTasks import get_task
+from detectionPipeline import run_task, get_scan_state
+from metrics import track_stream
+from requestOptions import parse_options
+from workspaces import workspaces
+
+NAMESPACE = '/scan'
+
+
+class ScanConfig:
+    ENABLED = os.getenv('AI_SOCKETIO', '1').lower() in ('1', 'true', 'yes')
+
+
+# Handlers run in the connection's own thread, so the frames of one scan stay in order
+socketio = SocketIO(cors_allowed_origins="*", async_mode='threading', async_handlers=False)
+
+# Open scan of each connection: sid -> {workspace, task_name, options}
+active_scans = {}
+
+
+def _error(message):
+    emit('result', {'success': False, 'error': message})
+
+
+@socketio.on('start_scan', namespace=NAMESPACE)
+def start_scan(data):
+    data = data or {}
+    try:
+        task = get_task(data.get('task'))
+        options = parse_options(data, [task.name])
+        workspace = workspaces.get_or_create(options.session_id)
+    except ValueError as e:
+        return _error(str(e))
+
+    active_scans[request.sid] = {
+        'workspace': workspace,
+        'task_name': task.name,
+        'options': options,
+    }
+    state = get_scan_state(workspace, task.name)
+    emit('scan_started', {
+        'session_id': workspace.id,
+        'task': task.name,
+        'frames_seen': state.frames_seen,
+        'num_placental': state.num_placental,
+    })
+
+
+@socketio.on('frame', namespace=NAMESPACE)
+def receive_frame(data):
+    scan = active_scans.get(request.sid)
+    if scan is None:
+        return _error("No scan started on this connection")
+
+    # Either the bare frame or {"frame": ...}; binary attachments arrive as bytes
+    frame = data.get('frame') if isinstance(data, dict) else data
+    if not frame:
+        return _error("No frame data")
+
+    results = run_task(scan['task_name'], [frame], workspace=scan['workspace'],
+                       **scan['options'].pipeline_kwargs(batch_size=1))
+    for result in track_stream(NAMESPACE, results, scan['task_name']):
+        emit('result', {'success': True, 'result': result})
+
+
+@socketio.on('end_scan', namespace=NAMESPACE)
+def end_scan(data=None):
+    scan = active_scans.pop(request.sid, None)
+    if scan is None:
+        return _error("No scan started on this connection")
+
+    state = get_scan_state(scan['workspace'], scan['task_name'])
+    emit('scan_summary', {'session_id': scan['workspace'].id, 'task': scan['task_name'], **state.summary()})
+
+
+@socketio.on('disconnect', namespace=NAMESPACE)
+def disconnect(reason=None):
+    # The scan state stays in the session workspace, so a new connection can resume it
+    active_scans.pop(request.sid, None)
@@ -0,0 +1,116 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Production entry point of the Flask AI backend. `python app.py` starts the Werkzeug debug server
+# for development; on the inference hosts the service is started with `python serve.py`, which runs
+# the same app under gunicorn.
+#
+# Key Features:
+"""
+Workers:
+- `AI_WORKERS`         : Number of worker processes (default 1, see Sessions below).
+- `AI_WORKER_THREADS`  : Threads per worker, i.e. concurrent streams per worker (default: CPU cores,
+                         at least 8).
+- `AI_TORCH_THREADS`   : Torch intra-op threads per worker (default: CPU cores / workers), also used
+                         for ONNX Runtime / OpenVINO models unless `AI_BACKEND_THREADS` is set.
+- `AI_BIND`            : Listen address (default `0.0.0.0:5000`).
+- `AI_SOCKETIO`        : `1` (default) serves the Socket.IO namespace `/scan`, which forces one worker.
+- `AI_WORKER_TIMEOUT`  : Seconds a silent worker may run before it is restarted (default 120).
+
+Each worker imports the app itself (no preloading in the master), so every worker owns its own
+model registry, frame writer and workspace janitor. Models are loaded eagerly when the worker
+starts unless `AI_MODEL_LOADING` says otherwise. The threaded worker class keeps server-sent
+event streams working.
+
+Sessions:
+- Workspaces, scan states, dedup windows and fan regions live in the memory of one worker.
+  gunicorn workers share one listening socket, so nothing can pin a `session_id` to a worker.
+- The default is therefore one worker with many threads: model calls release the GIL and the
+  shared models are serialised per model anyway, so threads scale about as well as workers.
+- With `AI_WORKERS` > 1 a request can land on another worker than the one holding its session:
+  that worker starts the session over (its own folder, `workspaces.py`), and `/sessions/<id>` or
+  session findings may answer 404. Only use several workers when clients send no `session_id`.
+- Flask-SocketIO supports a single gunicorn worker only (Engine.IO long-polling requests of one
+  connection must reach the same worker), so several workers also require `AI_SOCKETIO=0`.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# gunicorn               : Pre-fork WSGI server (Linux inference hosts).
+# torch                  : Per-worker intra-op thread configuration.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, DEPLOYMENT)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+from gunicorn.app.base import BaseApplication
+
+CPU_COUNT = os.cpu_count() or 1
+
+
+class ServeConfig:
+    REQUESTED_WORKERS = int(os.getenv('AI_WORKERS', '1'))
+    SOCKETIO = os.getenv('AI_SOCKETIO', '1').lower() in ('1', 'true', 'yes')
+    # Flask-SocketIO runs on a single gunicorn worker only
+    WORKERS = 1 if SOCKETIO else REQUESTED_WORKERS
+    WORKER_THREADS = int(os.getenv('AI_WORKER_THREADS', max(8, CPU_COUNT)))
+    TORCH_THREADS = int(os.getenv('AI_TORCH_THREADS', max(1, CPU_COUNT // WORKERS)))
+    BIND = os.getenv('AI_BIND', '0.0.0.0:5000')
+    TIMEOUT = int(os.getenv('AI_WORKER_TIMEOUT', '120'))
+
+
+def post_fork(server, worker):
+    """Pin the thread pools of a freshly forked worker before it imports torch and the models."""
+    threads = str(ServeConfig.TORCH_THREADS)
+    os.environ['OMP_NUM_THREADS'] = threads
+    os.environ['MKL_NUM_THREADS'] = threads
+    # ONNX Runtime and OpenVINO models get the same limit (see inferenceBackends.py)
+    os.environ.setdefault('AI_BACKEND_THREADS', threads)
+
+    import torch
+    torch.set_num_threads(ServeConfig.TORCH_THREADS)
+    server.log.info("Worker %s: torch intra-op threads = %s", worker.pid, ServeConfig.TORCH_THREADS)
+
+
+class InferenceServer(BaseApplication):
+    """gunicorn application that loads `app:app` separately in every worker."""
+
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+
+if __name__ == "__main__":
+    # Every worker keeps its own warm model set
+    os.environ.setdefault('AI_MODEL_LOADING', 'eager')
+    if ServeConfig.REQUESTED_WORKERS > ServeConfig.WORKERS:
+        print(f"AI_WORKERS={ServeConfig.REQUESTED_WORKERS} ignored: the Socket.IO namespace needs a single "
+              "worker (set AI_SOCKETIO=0 to serve the HTTP routes only)")
+    elif ServeConfig.WORKERS > 1:
+        print(f"AI_WORKERS={ServeConfig.WORKERS}: sessions are per worker and are not kept across requests "
+              "that land on different workers")
+
+    InferenceServer({
+        'bind': ServeConfig.BIND,
+        'workers': ServeConfig.WORKERS,
+        'worker_class': 'gthread',
+        'threads': ServeConfig.WORKER_THREADS,
+        'timeout': ServeConfig.TIMEOUT,
+        'preload_app': False,
+        'post_fork': post_fork,
+    }).run()
@@ -0,0 +1,170 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Per-stage timing of the frame pipeline (decode, dedup, cache lookup, inference, annotation,
+# analysis, encoding). Used by the benchmark to break down where frame time goes, and forwarded to
+# the `/metrics` histograms (`metrics.py`).
+#
+# Usage:
+"""
+    with stage_timer.stage('inference', model='Placenta_Position'):
+        results = model(images)
+
+Timing is off unless `AI_STAGE_TIMING=1`, `stage_timer.enabled` is set or an observer (such as the
+metrics module) is registered; a disabled stage costs a single attribute check. Observers receive
+`(stage, seconds, labels)` for every timed stage.
+
+`snapshot()` returns count, total and mean per stage, `reset()` clears it.
+
+Request traces:
+- `traced(results, RequestTrace(route=...))` runs a request's pipeline with the trace bound to it;
+  its labels are added to every stage the request times, so observers can split stages by route.
+- The frame batcher notes when the pipeline takes each frame (`frame_taken`), which gives the
+  per-frame latency up to the frame's result.
+- The trace follows the request into the pipeline's background threads and worker pools
+  (`stagedPipeline.py` runs their work in a copy of the submitting context).
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# time / threading       : Monotonic timers and thread-safe totals.
+# contextvars            : The trace of the request being processed.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, INSTRUMENTATION)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import time
+import threading
+import contextvars
+
+
+class StageConfig:
+    ENABLED = os.getenv('AI_STAGE_TIMING', '0').lower() in ('1', 'true', 'yes')
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'labels', 'start')
+
+    def __init__(self, timer, name, labels):
+        self.timer = timer
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.record(self.name, time.perf_counter() - self.start, self.labels)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class RequestTrace:
+    """Labels of one request (e.g. its route) and when the pipeline took each of its frames."""
+
+    def __init__(self, **labels):
+        self.labels = labels
+        self.taken = {}  # frame number -> perf_counter() when the frame entered the pipeline
+
+
+# Trace of the request whose pipeline runs in the current context
+_trace = contextvars.ContextVar('request_trace', default=None)
+
+
+def frame_taken(frame_number):
+    """Note that the pipeline took `frame_number` of the current request."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.taken[frame_number] = time.perf_counter()
+
+
+def traced(results, trace):
+    """Iterate a request's `results` with `trace` bound while its pipeline runs."""
+    iterator = iter(results)
+    try:
+        while True:
+            token = _trace.set(trace)
+            try:
+                result = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _trace.reset(token)
+            yield result
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            token = _trace.set(trace)
+            try:
+                close()
+            finally:
+                _trace.reset(token)
+
+
+class StageTimer:
+    """Accumulates the time spent in each named pipeline stage."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self._totals = {}  # stage -> [count, total seconds]
+        self._observers = []
+        self._lock = threading.Lock()
+
+    def add_observer(self, observer):
+        """Call `observer(stage, seconds, labels)` for every timed stage (enables timing)."""
+        self._observers.append(observer)
+        self.enabled = True
+
+    def stage(self, name, **labels):
+        """Context manager timing one pass through stage `name`."""
+        return _Stage(self, name, labels) if self.enabled else _NULL_STAGE
+
+    def record(self, name, seconds, labels=None):
+        trace = _trace.get()
+        if trace is not None:
+            labels = {**trace.labels, **(labels or {})}
+        with self._lock:
+            totals = self._totals.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+        for observer in self._observers:
+            observer(name, seconds, labels or {})
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+
+    def snapshot(self):
+        with self._lock:
+            totals = {name: list(values) for name, values in self._totals.items()}
+        return {
+            name: {
+                'count': count,
+                'total_seconds': round(total, 4),
+                'mean_ms': round(total / count * 1000, 3) if count else 0.0,
+            }
+            for name, (count, total) in totals.items()
+        }
+
+
+# Shared timer of the detection pipeline
+stage_timer = StageTimer(StageConfig.ENABLED)
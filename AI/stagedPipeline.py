@@ -0,0 +1,182 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# Building blocks of the staged frame pipeline. Image decoding, annotation and JPEG encoding run in
+# shared worker pools (OpenCV releases the GIL while it works), and whole stages run on background
+# threads joined by bounded queues, so the models keep inferring while codec work happens.
+#
+# Key Features:
+"""
+Stages of `detectionPipeline.run_task` / `run_tasks`:
+- Frame source : Read ahead on a background thread (videos, stored job frames).
+- Decode       : `AI_DECODE_WORKERS` pool threads (default: up to 4, one per core).
+- Inference    : Batching, deduplication and the model calls on a per-request background thread.
+- Annotate     : `result.plot()` and the JPEG / base64 encoding in `AI_ENCODE_WORKERS` pool threads.
+- Results      : Scan state updates and the yielded results on the request thread, in frame order.
+
+Backpressure:
+- `staged()` / `ReadAhead` keep at most `depth` items between two stages (`AI_STAGE_QUEUE`
+  batches, default 2); a producer that runs ahead blocks until the consumer catches up.
+- `ReadAhead.get(timeout)` lets a consumer stop waiting, e.g. to flush a partial batch.
+- Closing the consumer (e.g. a client disconnecting from the SSE stream) stops the producer.
+- Errors of a stage are raised in the consumer, at the position where they happened.
+
+`AI_STAGE_QUEUE=0` and zero pool workers run every stage inline on the request thread, as before.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# threading / queue      : Background stages and bounded queues between them.
+# concurrent.futures     : Decode and encode worker pools.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, AI PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import queue
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class StageConfig:
+    DECODE_WORKERS = int(os.getenv('AI_DECODE_WORKERS', str(DEFAULT_WORKERS)))
+    ENCODE_WORKERS = int(os.getenv('AI_ENCODE_WORKERS', str(DEFAULT_WORKERS)))
+    QUEUE_DEPTH = int(os.getenv('AI_STAGE_QUEUE', '2'))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, workers):
+    """Process-wide worker pool `name` (None when `workers` is 0: work runs inline)."""
+    if workers <= 0:
+        return None
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        return _pools[name]
+
+
+def decode_pool():
+    return get_pool('decode', StageConfig.DECODE_WORKERS)
+
+
+def encode_pool():
+    return get_pool('encode', StageConfig.ENCODE_WORKERS)
+
+
+def submit(pool, fn, *args):
+    """Run `fn(*args)` in `pool`, or right away without one; either way a future is returned."""
+    if pool is not None:
+        # The work runs in the caller's context, so it keeps the request trace (`stageTimer.py`)
+        return pool.submit(contextvars.copy_context().run, fn, *args)
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def pipeline_depth(frames):
+    """Items queued between stages for `frames` (0, all inline, for a single frame)."""
+    if isinstance(frames, (list, tuple)) and len(frames) <= 1:
+        return 0
+    return StageConfig.QUEUE_DEPTH
+
+
+class _Failure:
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+_DONE = object()
+
+
+class ReadAhead:
+    """
+    Iterate `iterable` on a background thread, at most `depth` items ahead of the consumer.
+
+    `get()` returns the items in their original order, raises StopIteration once the iterable is
+    exhausted and re-raises an exception of the producer. With a `timeout` it raises queue.Empty
+    when no item arrived in time. With `depth` 0 the iterable is consumed inline.
+    """
+
+    def __init__(self, iterable, depth, name='stage'):
+        self._iterator = iter(iterable)
+        self._items = None
+        self._stop = threading.Event()
+        if depth > 0:
+            self._items = queue.Queue(maxsize=depth)
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(self._produce,), name=name, daemon=True).start()
+
+    def _put(self, item):
+        # Wait for room in the queue, unless the consumer has gone away
+        while not self._stop.is_set():
+            try:
+                self._items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        outcome = _DONE
+        try:
+            for item in self._iterator:
+                if not self._put(item):
+                    return
+        except Exception as e:
+            outcome = _Failure(e)
+        finally:
+            close = getattr(self._iterator, 'close', None)
+            if close is not None:
+                close()
+            self._put(outcome)
+
+    def get(self, timeout=None):
+        if self._items is None:
+            return next(self._iterator)
+        item = self._items.get(timeout=timeout)
+        if item is _DONE:
+            # Later calls keep reporting the end
+            self._items.put(_DONE)
+            raise StopIteration
+        if isinstance(item, _Failure):
+            raise item.error
+        return item
+
+    def close(self):
+        self._stop.set()
+        if self._items is None:
+            close = getattr(self._iterator, 'close', None)
+            if close is not None:
+                close()
+
+
+def staged(iterable, depth, name='stage'):
+    """Generator over a `ReadAhead` of `iterable` (inline with `depth` 0)."""
+    reader = ReadAhead(iterable, depth, name)
+    try:
+        while True:
+            try:
+                item = reader.get()
+            except StopIteration:
+                return
+            yield item
+    finally:
+        reader.close()
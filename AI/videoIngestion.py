@@ -0,0 +1,125 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module decodes ultrasound videos on the server so the frontend can submit a whole MP4 (or
+# the name of a video already stored by the Node backend) instead of uploading every frame as a
+# base64 PNG.
+#
+# Key Features:
+"""
+Video Sources:
+- Saves an uploaded MP4 into the session's `video` folder under a unique name.
+- Resolves the name of a video already stored in `backend/Routes/uploads` (`AI_UPLOADS_DIR`).
+  Only plain file names inside that folder are accepted.
+
+Frame Sampling:
+- Reads the video with `cv2.VideoCapture` and samples it at the requested frame rate.
+- Skipped frames are only grabbed, not decoded, so low sampling rates stay cheap.
+- An optional time range (`start` / `end` seconds) restricts sampling to part of the video.
+- Yields decoded BGR frames that the detection modules accept directly.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# OpenCV (cv2)           : Video decoding.
+# uuid                   : Unique names for uploaded videos.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, VIDEO PROCESSING)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import uuid
+import cv2
+from pathlib import Path
+
+base_dir = Path(os.getenv('AI_BASE_DIR', os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class VideoConfig:
+    UPLOADS_DIR = Path(os.getenv('AI_UPLOADS_DIR', base_dir / 'backend' / 'Routes' / 'uploads'))
+    VIDEO_SAVE_DIR = "video"
+    DEFAULT_SAMPLE_FPS = float(os.getenv('AI_VIDEO_SAMPLE_FPS', '30'))
+    ALLOWED_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+
+
+def resolve_upload_path(name):
+    """Return the path of a video stored in the uploads folder, rejecting anything outside it."""
+    if not name or os.path.basename(name) != name:
+        raise ValueError("Invalid video name")
+    if Path(name).suffix.lower() not in VideoConfig.ALLOWED_EXTENSIONS:
+        raise ValueError("Unsupported video format")
+
+    path = VideoConfig.UPLOADS_DIR / name
+    if not path.is_file():
+        raise FileNotFoundError(f"Video not found: {name}")
+    return str(path)
+
+
+def save_uploaded_video(file_storage, directory=None):
+    """Save an uploaded video (werkzeug FileStorage) into `directory` and return its path."""
+    suffix = Path(file_storage.filename or '').suffix.lower() or '.mp4'
+    if suffix not in VideoConfig.ALLOWED_EXTENSIONS:
+        raise ValueError("Unsupported video format")
+
+    directory = directory or VideoConfig.VIDEO_SAVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}{suffix}")
+    file_storage.save(path)
+    return path
+
+
+def resolve_fps(value=None):
+    """Validate a requested sampling rate; None (or empty) keeps the default."""
+    if value in (None, ''):
+        return None
+    try:
+        sample_fps = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("fps must be a number")
+    if not sample_fps > 0:
+        raise ValueError("Sampling rate must be positive")
+    return sample_fps
+
+
+def iter_video_frames(video_path, sample_fps=None, start=0.0, end=None):
+    """Yield decoded frames from `video_path`, sampled at `sample_fps` frames per second in [start, end)."""
+    sample_fps = VideoConfig.DEFAULT_SAMPLE_FPS if sample_fps is None else float(sample_fps)
+    if sample_fps <= 0:
+        raise ValueError("Sampling rate must be positive")
+
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+
+    try:
+        native_fps = capture.get(cv2.CAP_PROP_FPS) or sample_fps
+        sample_interval = 1.0 / sample_fps
+        next_sample_time = float(start or 0.0)
+        frame_index = 0
+
+        while True:
+            # grab() advances without decoding; retrieve() only for sampled frames
+            if not capture.grab():
+                break
+            frame_time = frame_index / native_fps
+            frame_index += 1
+
+            if end is not None and frame_time >= end:
+                break
+            if frame_time + 1e-6 < next_sample_time:
+                continue
+
+            ok, frame = capture.retrieve()
+            if not ok:
+                break
+            next_sample_time += sample_interval
+            yield frame
+    finally:
+        capture.release()
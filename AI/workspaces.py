@@ -0,0 +1,207 @@
+######################################################################################################
+#                           SETV HEALTHCARE TECHNOLOGIES PRIVATE LIMITED
+#                PREGNANCY TRACKER SOURCE CODE VERSION 2.0  (READY FOR  DEPLOYMENT)
+#----------------------------------------------------------------------------------------------------
+#                           BASIC INFORMATION ABOUT THE FILE
+#----------------------------------------------------------------------------------------------------
+# This module gives every scan session its own scratch folder for frames, videos and report
+# images. Concurrent requests therefore never overwrite each other's files, and nothing is
+# deleted at import time any more; old workspaces are removed by a background janitor.
+#
+# Key Features:
+"""
+Workspaces:
+- Each workspace lives in `AI_WORKSPACE_ROOT/worker-<pid>/<id>` (default root `frames/workspaces`)
+  and contains `placental_frames`, `no_placental_frames` and `video` folders.
+- Workspaces are held in the memory of the process that created them. The process id in the path
+  keeps two gunicorn workers that both see a session id from ever writing into the same folder;
+  a session only continues (scan state, frame numbering) on the worker that created it, which is
+  why `serve.py` runs one worker by default.
+- A client can keep using the same workspace by sending its `session_id` (or the
+  `X-Session-Id` header) back; frame numbers then continue across requests.
+- Frame numbers are handed out by the workspace, so they stay unique within a session; a workspace
+  recreated for a folder that already holds frames continues after the last one.
+- Requests without a session id get an anonymous workspace, which is forgotten (`release`) as soon
+  as their stream ends; its folder is left to the janitor. Clients that want statistics across
+  requests send their own `session_id` from the first request on.
+
+Janitor:
+- A daemon thread removes workspaces that have not been used for `AI_WORKSPACE_TTL` seconds
+  (default 3600), checking every `AI_WORKSPACE_JANITOR_INTERVAL` seconds (default 300).
+- Leftover folders of processes that are no longer running are removed once their TTL has passed.
+"""
+
+######################################################################################################
+#                                    KEY LIBRARIES AND DEPENDENCIES                                 #
+######################################################################################################
+# shutil                 : Removes expired workspace folders.
+# uuid                   : Unique workspace ids.
+# psutil                 : Whether the process owning a leftover worker folder is still running.
+# threading              : Janitor thread and workspace bookkeeping.
+#----------------------------------------------------------------------------------------------------
+# ENV OF FILE : BACKEND (PYTHON, FILE STORAGE)
+# SECURITY CODE LEVEL : HIGH
+######################################################################################################
+
+###################################### CODE STARTS HERE ##############################################
+
+import os
+import re
+import time
+import uuid
+import shutil
+import threading
+import psutil
+
+# Session ids come from clients, so they are restricted to safe folder names
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+FRAME_FILE_PATTERN = re.compile(r'^frame_(\d+)\.jpg$')
+
+
+class WorkspaceConfig:
+    ROOT = os.getenv('AI_WORKSPACE_ROOT', os.path.join('frames', 'workspaces'))
+    TTL_SECONDS = float(os.getenv('AI_WORKSPACE_TTL', '3600'))
+    JANITOR_INTERVAL = float(os.getenv('AI_WORKSPACE_JANITOR_INTERVAL', '300'))
+
+
+class Workspace:
+    """Scratch folders and frame numbering of one scan session."""
+
+    def __init__(self, workspace_id, root, anonymous=False):
+        self.id = workspace_id
+        self.root = root
+        # Created without a session id: only needed for the request that created it
+        self.anonymous = anonymous
+        self.placental_frames_dir = os.path.join(root, 'placental_frames')
+        self.no_placental_frames_dir = os.path.join(root, 'no_placental_frames')
+        self.video_dir = os.path.join(root, 'video')
+        self.last_used = time.time()
+        # Per-exam scan statistics of this session (see detectionPipeline.ScanState)
+        self.scan_states = {}
+        # Near-duplicate frame checks of this session (see frameDedup.FrameDeduplicator)
+        self.deduplicators = {}
+        # Ultrasound sector crop per frame size (see fanRegion.get_fan_region)
+        self.fan_regions = {}
+        self._lock = threading.Lock()
+
+        for directory in (self.placental_frames_dir, self.no_placental_frames_dir, self.video_dir):
+            os.makedirs(directory, exist_ok=True)
+        self._next_frame = self._first_free_frame()
+
+    def _first_free_frame(self):
+        # Frames stored under this id before (e.g. by a released anonymous workspace) are not overwritten
+        numbers = [
+            int(match.group(1))
+            for directory in (self.placental_frames_dir, self.no_placental_frames_dir)
+            for match in (FRAME_FILE_PATTERN.match(name) for name in os.listdir(directory))
+            if match
+        ]
+        return max(numbers) + 1 if numbers else 0
+
+    def touch(self):
+        self.last_used = time.time()
+
+    def next_frame_number(self):
+        """Hand out the next frame number of this session."""
+        with self._lock:
+            frame_number = self._next_frame
+            self._next_frame += 1
+        self.touch()
+        return frame_number
+
+
+class WorkspaceManager:
+    """Creates, reuses and expires per-session workspaces."""
+
+    def __init__(self, root, ttl_seconds, janitor_interval):
+        self.root = root
+        # Folders of this process; other worker processes of the same server use their own
+        self.process_root = os.path.join(root, f'worker-{os.getpid()}')
+        self.ttl_seconds = ttl_seconds
+        self.janitor_interval = janitor_interval
+        self._workspaces = {}
+        self._lock = threading.Lock()
+        self._janitor = None
+
+    def _ensure_janitor(self):
+        if self._janitor is None:
+            self._janitor = threading.Thread(target=self._run_janitor, name='workspace-janitor', daemon=True)
+            self._janitor.start()
+
+    def create(self):
+        return self.get_or_create(None)
+
+    def get_or_create(self, session_id=None):
+        """Return the workspace for `session_id`, creating it (or a new anonymous one) if needed."""
+        if session_id is not None and not SESSION_ID_PATTERN.match(session_id):
+            raise ValueError("Invalid session id")
+
+        with self._lock:
+            self._ensure_janitor()
+            workspace_id = session_id or uuid.uuid4().hex
+            workspace = self._workspaces.get(workspace_id)
+            if workspace is None:
+                workspace = Workspace(workspace_id, os.path.join(self.process_root, workspace_id),
+                                      anonymous=session_id is None)
+                self._workspaces[workspace_id] = workspace
+            elif session_id is not None:
+                # A client sent the id back while the first request was still running: it is a session now
+                workspace.anonymous = False
+            workspace.touch()
+            return workspace
+
+    def release(self, workspace):
+        """Forget an anonymous workspace once its request is done (the folder is left to the janitor)."""
+        with self._lock:
+            if workspace.anonymous and self._workspaces.get(workspace.id) is workspace:
+                del self._workspaces[workspace.id]
+
+    def get(self, session_id):
+        """Return the existing workspace for `session_id`, or None."""
+        with self._lock:
+            workspace = self._workspaces.get(session_id)
+        if workspace is not None:
+            workspace.touch()
+        return workspace
+
+    def cleanup_expired(self):
+        """Remove workspaces (and leftover folders) unused for longer than the TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [ws for ws in self._workspaces.values() if ws.last_used < cutoff]
+            for workspace in expired:
+                del self._workspaces[workspace.id]
+            active = set(self._workspaces)
+
+        for workspace in expired:
+            shutil.rmtree(workspace.root, ignore_errors=True)
+
+        # Folders left behind by this process (e.g. after a crash of a request) are not tracked in memory
+        if os.path.isdir(self.process_root):
+            for entry in os.scandir(self.process_root):
+                if entry.is_dir() and entry.name not in active and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+
+        # Folders of earlier processes; those of running sibling workers are theirs to clean up
+        if os.path.isdir(self.root):
+            for entry in os.scandir(self.root):
+                if not entry.is_dir() or entry.path == self.process_root or entry.stat().st_mtime >= cutoff:
+                    continue
+                pid = entry.name[len('worker-'):]
+                if entry.name.startswith('worker-') and pid.isdigit() and psutil.pid_exists(int(pid)):
+                    continue
+                shutil.rmtree(entry.path, ignore_errors=True)
+        return len(expired)
+
+    def _run_janitor(self):
+        while True:
+            time.sleep(self.janitor_interval)
+            try:
+                self.cleanup_expired()
+            except Exception:
+                # The janitor must never die; the next pass will retry
+                pass
+
+
+# Shared workspace manager used by the routes and detection modules
+workspaces = WorkspaceManager(WorkspaceConfig.ROOT, WorkspaceConfig.TTL_SECONDS, WorkspaceConfig.JANITOR_INTERVAL)